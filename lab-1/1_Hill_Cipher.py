@@ -1,54 +1,14 @@
-from sympy import Matrix, pprint, latex
+from sympy import Matrix, latex
 from itertools import product
 from random import sample
-
-
-alphabet_dict = {
-    'А': 0,
-    'Б': 1,
-    'В': 2,
-    'Г': 3,
-    'Д': 4,
-    'Е': 5,
-    'Ё': 6,
-    'Ж': 7,
-    'З': 8,
-    'И': 9,
-    'Й': 10,
-    'К': 11,
-    'Л': 12,
-    'М': 13,
-    'Н': 14,
-    'О': 15,
-    'П': 16,
-    'Р': 17,
-    'С': 18,
-    'Т': 19,
-    'У': 20,
-    'Ф': 21,
-    'Х': 22,
-    'Ц': 23,
-    'Ч': 24,
-    'Ш': 25,
-    'Щ': 26,
-    'Ы': 27,
-    'Э': 28,
-    'Ю': 29,
-    'Я': 30
-}
-
-
-reversed_alph_dict = dict(map(lambda x: x[::-1], alphabet_dict.items()))
-
-
-def gcd(a, b):  # Алгоритм Евклида
-    while b != 0:
-        a, b = b, a % b
-    return a
+from alphabet import alphabet_dict, reversed_alph_dict, codec
+from modular import det_mod
+from hill import Hill_cipher_blocks, gcd, make_blocks, to_array, word_from_codes, prepare_key
+from report import SUMMARY, DETAIL, enabled, say, show
 
 
 def generate_vect_from_word(word: str) -> Matrix:
-    return Matrix([alphabet_dict[s] for s in word])
+    return Matrix(codec.encode(word))
 
 def make_subvectors(v: Matrix, length: int) -> list:  # Поделить вектор на меньшие вектора
     subvectors = []
@@ -57,8 +17,7 @@ def make_subvectors(v: Matrix, length: int) -> list:  # Поделить век
         subvectors.append(v[start:start + length, 0])
         start += length
 
-    print('\nВекторы - сообщение:\n')
-    pprint(subvectors)
+    show(DETAIL, 'Векторы - сообщение', subvectors)  # большой набор сокращается, при выключенном DETAIL не форматируется
 
     return subvectors
 
@@ -78,102 +37,86 @@ def Hill_cipher(key: Matrix, vect: Matrix) -> Matrix: # Шифр Хилла: у
 
 
 def translate_from_vectors(vects_list: list) -> str: # генерация слова из векторов - сообщений
-    message = ''
-    vects_nums = range(len(vects_list))
-    vects_row_idxs, vects_col_idxs = range(vects_list[0].shape[0]), range(vects_list[0].shape[1])
-    for p, i, j in product(vects_nums, vects_row_idxs, vects_col_idxs):
-        message += reversed_alph_dict[vects_list[p][i, j]]
-    return message
+    return codec.decode([x for v in vects_list for x in v])  # элементы матриц идут построчно, как и раньше
 
 
 def start_coding(key: Matrix, p: Matrix, num: int = 0) -> str: # Функция выполнения кодирования с выводом информации в консоль
-    print(f'\n{num})------------------------------------------')
-    subvectors = make_subvectors(p, key.shape[1])
-    
-    print('\nКлюч:\n')
-    pprint(key)
+    say(SUMMARY, f'\n{num})------------------------------------------')
+    if enabled(DETAIL):  # разбиение на sympy-векторы нужно только для вывода
+        make_subvectors(p, key.shape[1])
+    show(DETAIL, 'Ключ', key)
 
-    close_vectors = []
-    for subv in subvectors:
-        close_v = Hill_cipher(key, subv)
-        close_vectors.append(close_v)
-        
-    print('\nЗашифрованные вектора - сообщение:\n')
-    pprint(close_vectors)
-    
-    cipher_word = translate_from_vectors(close_vectors)
-    print('\nЗашифрованное сообщение:', ' '.join(cipher_word))
-    print(f'-------------------------------------------\n')
+    close_blocks = Hill_cipher_blocks(to_array(key), make_blocks(p, key.shape[1]))  # все блоки одним умножением
+    show(DETAIL, 'Зашифрованные вектора - сообщение', lambda: list(close_blocks))
+
+    cipher_word = word_from_codes(close_blocks)
+    say(SUMMARY, lambda: '\nЗашифрованное сообщение: ' + ' '.join(cipher_word))
+    say(SUMMARY, f'-------------------------------------------\n')
     return cipher_word
     
     
 def damage_cipher_word(word: str, k: int) -> str:  # Функция повреждения сообщения с выводом полезных фактов в консоль
-    print('\n############################################')
-    print('Зашифрованное сообщение:', ' '.join(word))
+    say(SUMMARY, '\n############################################')
+    say(SUMMARY, lambda: 'Зашифрованное сообщение: ' + ' '.join(word))
     damage_word = list(word)
     dict_letter_idxs = sample(sorted(alphabet_dict.values()), k)
     word_replace_idxs = sample(list(range(len(word))), k)
     for u, v in zip(word_replace_idxs, dict_letter_idxs):
-        print(f'Замена: {damage_word[u]} -> {reversed_alph_dict[v]}')
+        say(SUMMARY, f'Замена: {damage_word[u]} -> {reversed_alph_dict[v]}')
         damage_word[u] = reversed_alph_dict[v]
         
     damage_word = ''.join(damage_word)
-    print('Искажённое сообщение:' + ' '*(len('Зашифрованное сообщение:') - len('Искажённое сообщение:')), ' '.join(damage_word))
-    print('############################################\n')
+    say(SUMMARY, lambda: 'Искажённое сообщение: '.ljust(len('Зашифрованное сообщение: ')) + ' '.join(damage_word))
+    say(SUMMARY, '############################################\n')
     return damage_word
 
 
 def start_decoding(key: Matrix, c: Matrix) -> str:  # Функция декодирования и pretty вывода информации в консоль
-    print('\n============================================')
-    print('Дешифрую слово:', ' '.join(translate_from_vectors([c])))
-    reversed_key = key.inv_mod(len(alphabet_dict))
-    subvectors = make_subvectors(c, key.shape[1])
-
-    print('\nОбратный ключ:\n')
-    pprint(reversed_key)
-
-    open_vectors = []
-    for subv in subvectors:
-        open_v = Hill_cipher(reversed_key, subv)
-        open_vectors.append(open_v)
-        
-    print('\nРасшифрованные вектора - сообщение:\n')
-    pprint(open_vectors)
-    
-    decode_cipher_word = translate_from_vectors(open_vectors)
-    print('\nРасшифрованное сообщение:', ' '.join(decode_cipher_word))
-    print('============================================\n')
+    say(SUMMARY, '\n============================================')
+    say(SUMMARY, lambda: 'Дешифрую слово: ' + ' '.join(translate_from_vectors([c])))
+    reversed_key = prepare_key(key).inverse  # обратный ключ берётся из кэша
+    if enabled(DETAIL):
+        make_subvectors(c, key.shape[1])
+    show(DETAIL, 'Обратный ключ', reversed_key)
+
+    open_blocks = Hill_cipher_blocks(reversed_key, make_blocks(c, key.shape[1]))
+    show(DETAIL, 'Расшифрованные вектора - сообщение', lambda: list(open_blocks))
+
+    decode_cipher_word = word_from_codes(open_blocks)
+    say(SUMMARY, lambda: '\nРасшифрованное сообщение: ' + ' '.join(decode_cipher_word))
+    say(SUMMARY, '============================================\n')
     return decode_cipher_word
 
         
-word = 'ПРОСТРАНСТВО'
-print('Исходное сообщение:', ' '.join(word))
-
-# Задаём наши ключи. Если их определитель равен нулю, получим ошибку
-K1 = Matrix([[alphabet_dict['К'], alphabet_dict['Ы']], 
-             [alphabet_dict['У'], alphabet_dict['Ц']]])
-assert K1.det() % len(alphabet_dict) != 0
-K2 = Matrix([[alphabet_dict['М'], alphabet_dict['Л'], alphabet_dict['К']],
-            [alphabet_dict['Т'], alphabet_dict['Я'], alphabet_dict['Х']],
-            [alphabet_dict['Ч'], alphabet_dict['Щ'], alphabet_dict['З']]])
-assert K2.det() % len(alphabet_dict) != 0
-K3 = Matrix([[alphabet_dict['Ч'], alphabet_dict['Г'], alphabet_dict['П'], alphabet_dict['Ф']],
-            [alphabet_dict['Д'], alphabet_dict['Ж'], alphabet_dict['Й'], alphabet_dict['Ш']],
-            [alphabet_dict['И'], alphabet_dict['А'], alphabet_dict['Э'], alphabet_dict['К']],
-            [alphabet_dict['Ю'], alphabet_dict['О'], alphabet_dict['Ы'], alphabet_dict['Н']]])
-assert K3.det() % len(alphabet_dict) != 0
-
-# Шифруем наше сообщение различными ключами
-cipher_word_K1 = start_coding(key=K1, p=generate_vect_from_word(word), num=1)
-cipher_word_K2 = start_coding(key=K2, p=generate_vect_from_word(word), num=2)
-cipher_word_K3 = start_coding(key=K3, p=generate_vect_from_word(word), num=3)
-
-# Искажаем зашифрованные сообщения
-damage_word_K1 = damage_cipher_word(word=cipher_word_K1, k=3)
-damage_word_K2 = damage_cipher_word(word=cipher_word_K2, k=3)
-damage_word_K3 = "ЯЗСГЩСОЙУКЁР"
-
-# Дешифруем искажённые сообщения
-start_decoding(key=K1, c=generate_vect_from_word(damage_word_K1))
-start_decoding(key=K2, c=generate_vect_from_word(damage_word_K2))
-start_decoding(key=K3, c=generate_vect_from_word(damage_word_K3))
\ No newline at end of file
+if __name__ == '__main__':
+    word = 'ПРОСТРАНСТВО'
+    say(SUMMARY, lambda: 'Исходное сообщение: ' + ' '.join(word))
+
+    # Задаём наши ключи. Если их определитель равен нулю, получим ошибку
+    K1 = Matrix([[alphabet_dict['К'], alphabet_dict['Ы']], 
+                 [alphabet_dict['У'], alphabet_dict['Ц']]])
+    assert det_mod(K1, len(alphabet_dict)) != 0
+    K2 = Matrix([[alphabet_dict['М'], alphabet_dict['Л'], alphabet_dict['К']],
+                [alphabet_dict['Т'], alphabet_dict['Я'], alphabet_dict['Х']],
+                [alphabet_dict['Ч'], alphabet_dict['Щ'], alphabet_dict['З']]])
+    assert det_mod(K2, len(alphabet_dict)) != 0
+    K3 = Matrix([[alphabet_dict['Ч'], alphabet_dict['Г'], alphabet_dict['П'], alphabet_dict['Ф']],
+                [alphabet_dict['Д'], alphabet_dict['Ж'], alphabet_dict['Й'], alphabet_dict['Ш']],
+                [alphabet_dict['И'], alphabet_dict['А'], alphabet_dict['Э'], alphabet_dict['К']],
+                [alphabet_dict['Ю'], alphabet_dict['О'], alphabet_dict['Ы'], alphabet_dict['Н']]])
+    assert det_mod(K3, len(alphabet_dict)) != 0
+
+    # Шифруем наше сообщение различными ключами
+    cipher_word_K1 = start_coding(key=K1, p=generate_vect_from_word(word), num=1)
+    cipher_word_K2 = start_coding(key=K2, p=generate_vect_from_word(word), num=2)
+    cipher_word_K3 = start_coding(key=K3, p=generate_vect_from_word(word), num=3)
+
+    # Искажаем зашифрованные сообщения
+    damage_word_K1 = damage_cipher_word(word=cipher_word_K1, k=3)
+    damage_word_K2 = damage_cipher_word(word=cipher_word_K2, k=3)
+    damage_word_K3 = "ЯЗСГЩСОЙУКЁР"
+
+    # Дешифруем искажённые сообщения
+    start_decoding(key=K1, c=generate_vect_from_word(damage_word_K1))
+    start_decoding(key=K2, c=generate_vect_from_word(damage_word_K2))
+    start_decoding(key=K3, c=generate_vect_from_word(damage_word_K3))
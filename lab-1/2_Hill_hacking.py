@@ -1,47 +1,13 @@
-from sympy import Matrix, zeros, pprint
-from random import sample
+from sympy import Matrix, pprint
 from itertools import product
-
-
-alphabet_dict = {
-    'А': 0,
-    'Б': 1,
-    'В': 2,
-    'Г': 3,
-    'Д': 4,
-    'Е': 5,
-    'Ё': 6,
-    'Ж': 7,
-    'З': 8,
-    'И': 9,
-    'Й': 10,
-    'К': 11,
-    'Л': 12,
-    'М': 13,
-    'Н': 14,
-    'О': 15,
-    'П': 16,
-    'Р': 17,
-    'С': 18,
-    'Т': 19,
-    'У': 20,
-    'Ф': 21,
-    'Х': 22,
-    'Ц': 23,
-    'Ч': 24,
-    'Ш': 25,
-    'Щ': 26,
-    'Ы': 27,
-    'Э': 28,
-    'Ю': 29,
-    'Я': 30
-}
-
-reversed_alph_dict = dict(map(lambda x: x[::-1], alphabet_dict.items()))
+from alphabet import alphabet_dict, codec
+from modular import inv_mod, solve_mod
+from hill import prepare_key, generate_keys, to_array
+from hill_recovery import select_independent_blocks
 
 
 def generate_vect_from_word(word: str) -> Matrix:
-    return Matrix([alphabet_dict[s] for s in word])
+    return Matrix(codec.encode(word))
 
 
 def make_subvectors(v: Matrix, length: int) -> list:  # Поделить вектор на меньшие вектора
@@ -69,24 +35,12 @@ def Hill_cipher(key: Matrix, vect: Matrix) -> Matrix: # Шифр Хилла: у
 
 
 def translate_from_vectors(vects_list: list) -> str: # генерация слова из векторов - сообщений
-    message = ''
-    vects_nums = range(len(vects_list))
-    vects_row_idxs, vects_col_idxs = range(vects_list[0].shape[0]), range(vects_list[0].shape[1])
-    for p, i, j in product(vects_nums, vects_row_idxs, vects_col_idxs):
-        message += reversed_alph_dict[vects_list[p][i, j]]
-    return message
-
-
-def generate_key(size: int) -> Matrix:
-    random_elements = sample(sorted(alphabet_dict.keys()), k=size*size)
-    row_idxs, col_idxs = range(size), range(size)
-    key = zeros(size)
-    for i, j in product(row_idxs, col_idxs):
-        key[i, j] = alphabet_dict[random_elements.pop()]
-    if key.det() % len(alphabet_dict) == 0:
-        generate_key(size)
-    else:
-        return key
+    return codec.decode([x for v in vects_list for x in v])  # элементы матриц идут построчно, как и раньше
+
+
+def generate_key(size: int) -> Matrix:  # случайный обратимый ключ; раньше при вырожденном кандидате возвращался None
+    keys, _ = generate_keys(1, size)
+    return Matrix(keys[0])
 
 
 def start_coding(key: Matrix, p: Matrix, show_subvs: bool = False) -> str: # Функция выполнения кодирования с выводом информации в консоль
@@ -109,7 +63,7 @@ def start_coding(key: Matrix, p: Matrix, show_subvs: bool = False) -> str: # Ф
 
 def start_decoding(key: Matrix, c: Matrix, show_subvs: bool = False) -> str:  # Функция декодирования и pretty вывода информации в консоль
     print('\n============================================')
-    reversed_key = key.inv_mod(len(alphabet_dict))
+    reversed_key = Matrix(prepare_key(key).inverse)  # обратный ключ берётся из кэша
     subvectors = make_subvectors(c, key.shape[1])
 
     if show_subvs:
@@ -138,20 +92,16 @@ def repair_key(open_word: str, close_word: str, key_size: int, show_annot: bool
         print("\nЗашифрованные вектора\n")
         pprint(close_subvs)
 
-    random_idx_i, random_idx_j = sample(range(len(open_subvs)), 2)
-    p = open_subvs[random_idx_i].row_join(open_subvs[random_idx_j])
-    c = close_subvs[random_idx_i].row_join(close_subvs[random_idx_j])
-    while p.det() % len(alphabet_dict) == 0 or c.det() % len(alphabet_dict) == 0:
-        random_idx_i, random_idx_j = sample(range(len(open_subvs)), 2)
-        p = open_subvs[random_idx_i].row_join(open_subvs[random_idx_j])
-        c = close_subvs[random_idx_i].row_join(close_subvs[random_idx_j])
+    # n ЛНЗ векторов выбираются по порядку пошаговым Гауссом, без случайных повторов
+    idxs = select_independent_blocks(to_array([v.T for v in open_subvs]).reshape(-1, key_size), len(alphabet_dict))
+    p = Matrix.hstack(*[open_subvs[i] for i in idxs])
+    c = Matrix.hstack(*[close_subvs[i] for i in idxs])
 
     if show_annot:
         print("\nВыбранные вектора для матриц P и С (K = C * P**-1):\n")
         pprint([p, c])
 
-    reverse_p = p.inv_mod(len(alphabet_dict))
-    repaired_key = mod(c @ reverse_p)
+    repaired_key = Matrix(solve_mod(p.T, c.T, len(alphabet_dict)).T)  # P^T K^T = C^T
 
     if show_annot:
         print("\nПолученный ключ:\n")
@@ -161,39 +111,40 @@ def repair_key(open_word: str, close_word: str, key_size: int, show_annot: bool
     return repaired_key
 
 
-word1 = 'АББРЕВИАТУРА'
-with open('lab-1/word.txt', 'r', encoding='utf-8') as f:
-    word2 = ''
-    for el in f.readline():
-        word2 += el.upper()
+if __name__ == '__main__':
+    word1 = 'АББРЕВИАТУРА'
+    with open('lab-1/word.txt', 'r', encoding='utf-8') as f:
+        word2 = ''
+        for el in f.readline():
+            word2 += el.upper()
 
 
-key = generate_key(2)  # Бог его знает какой, обратимый, ключ.
+    key = generate_key(2)  # Бог его знает какой, обратимый, ключ.
 
-# cipher_word1 = start_coding(key, generate_vect_from_word(word1), show_subvs=True)  # Известное зашифрованное слово
-# decode_word1 = start_decoding(key, generate_vect_from_word(cipher_word1))  # Известное исходное слово
+    # cipher_word1 = start_coding(key, generate_vect_from_word(word1), show_subvs=True)  # Известное зашифрованное слово
+    # decode_word1 = start_decoding(key, generate_vect_from_word(cipher_word1))  # Известное исходное слово
 
 
-#-------------------------
-# Для восстановления ключа возьмём два случайных ЛНЗ вектора сообщения от зашифрованного и исходного слова (индексы должены совпадать!)
-# Составим из них матрицы 2x2 P(исходные векторы) и С(зашифрованные векторы) в столбцах которых будут взятые векторы.
-# Останется найти ключ по следующей формуле: K = C * P^-1
-#-------------------------
-# repaired_key = repair_key(decode_word1, cipher_word1, key.shape[1], show_annot=True)  # Восстановление ключа
+    #-------------------------
+    # Для восстановления ключа возьмём n первых ЛНЗ векторов сообщения от зашифрованного и исходного слова (индексы должены совпадать!)
+    # Составим из них матрицы nxn P(исходные векторы) и С(зашифрованные векторы) в столбцах которых будут взятые векторы.
+    # Останется найти ключ по следующей формуле: K = C * P^-1
+    #-------------------------
+    # repaired_key = repair_key(decode_word1, cipher_word1, key.shape[1], show_annot=True)  # Восстановление ключа
 
-# cipher_word2 = start_coding(key, generate_vect_from_word(word2))
-# decode_word2 = start_decoding(repaired_key, generate_vect_from_word(cipher_word2), show_subvs=True)
+    # cipher_word2 = start_coding(key, generate_vect_from_word(word2))
+    # decode_word2 = start_decoding(repaired_key, generate_vect_from_word(cipher_word2), show_subvs=True)
 
 
-# c1 = make_subvectors(generate_vect_from_word("ГАЗООБМЕННИК"), key.shape[1])
-k_rep = Matrix([
-    [11, 23],
-    [13, 9]
-])
-k_rep_rev = k_rep.inv_mod(len(alphabet_dict))
+    # c1 = make_subvectors(generate_vect_from_word("ГАЗООБМЕННИК"), key.shape[1])
+    k_rep = Matrix([
+        [11, 23],
+        [13, 9]
+    ])
+    k_rep_rev = Matrix(inv_mod(k_rep, len(alphabet_dict)))
 
-# pprint(c1)
+    # pprint(c1)
 
-start_coding(k_rep_rev, generate_vect_from_word("ГАЗООБМЕННИК"))
+    start_coding(k_rep_rev, generate_vect_from_word("ГАЗООБМЕННИК"))
 
-pprint(generate_vect_from_word("СЕДУЦХХРНВЯМ"))
\ No newline at end of file
+    pprint(generate_vect_from_word("СЕДУЦХХРНВЯМ"))
@@ -1,5 +1,6 @@
-from sympy import pprint, Matrix
+from sympy import Matrix
 from random import choices
+from report import SUMMARY, DETAIL, annotation, enabled, say, show
 
 
 HAMMING_ALL_BITS, HAMMING_INFO_BIT = 7, 4
@@ -44,14 +45,13 @@ REVERSED_BINARY_MATCH = dict(map(lambda x: x[::-1], BINARY_MATCH.items()))
 
 # Переводим слово в биты
 def binarization(word: str, show_annot: bool = False) -> str:
-    if show_annot:
-        print("-----------------------------------------------")
-        print(f"Переводим слово {word} в битовое представление:\n")
+    at = annotation(show_annot)
+    say(at, "-----------------------------------------------")
+    say(at, f"Переводим слово {word} в битовое представление:\n")
     binary_word = [BINARY_MATCH[letter] for letter in word]
     binary_word = ''.join(binary_word)
-    if show_annot:
-        print(binary_word)
-        print("-----------------------------------------------")
+    say(at, binary_word)
+    say(at, "-----------------------------------------------")
     return binary_word
 
 
@@ -64,18 +64,17 @@ def translate_to_binary_vectors(code: str, length: int) -> tuple:
         struct_v = list(map(lambda x: [int(x)], code[start:start+length]))
         binary_stack.append(Matrix(struct_v))
         start += length
-    print("-----------------------------------------------")
-    print("Разобьём двоичное представление слова на векторы высоты 4.")
-    print("Упорядоченный набор будет выглядеть следующим образом:\n")
-    pprint(tuple(binary_stack))
+    say(DETAIL, "-----------------------------------------------")
+    say(DETAIL, f"Разобьём двоичное представление слова на векторы высоты {length}.")
+    show(DETAIL, "Упорядоченный набор будет выглядеть следующим образом", tuple(binary_stack))
     return tuple(binary_stack)
 
 
 # Переводим векторы в одну слово
 def translate_to_word(R: Matrix, binary_vectors: tuple, show_annot: bool = False) -> str:
-    if show_annot:
-        print("-----------------------------------------------")
-        print("Превратим векторы в слово:\n")
+    at = annotation(show_annot)
+    say(at, "-----------------------------------------------")
+    say(at, "Превратим векторы в слово:\n")
     binary_word = ""
     for el in binary_vectors:
         l = R * el
@@ -89,9 +88,8 @@ def translate_to_word(R: Matrix, binary_vectors: tuple, show_annot: bool = False
         code = binary_word[start:start+step]
         new_word += REVERSED_BINARY_MATCH[code]
         start += step
-    if show_annot:
-        print(f"{binary_word} -> {new_word}")
-        print("-----------------------------------------------")
+    say(annotation(show_annot, SUMMARY), f"{binary_word} -> {new_word}")  # итог - как восстановленное сообщение
+    say(at, "-----------------------------------------------")
     return new_word
 
 
@@ -108,12 +106,11 @@ def Hamming(C: Matrix, v: Matrix) -> Matrix:
 
 # Искажает amount случайных, битов
 def damage_bits(binary_vectors: tuple, amount: int, show_annot: bool = False) -> tuple:
-    if show_annot:
-        print("-----------------------------------------------")
-        print("Исказим биты набора векторов.")
-        print("Сделаем это так, чтобы не исказилось два бита в одном векторе.")
-        print("Исходный набор:\n")
-        pprint(binary_vectors)
+    at = annotation(show_annot)
+    say(at, "-----------------------------------------------")
+    say(at, "Исказим биты набора векторов.")
+    say(at, "Сделаем это так, чтобы не исказилось два бита в одном векторе.")
+    show(at, "Исходный набор", binary_vectors)
     damaged_vectors = list(binary_vectors)
     idxs = choices(range(HAMMING_ALL_BITS), k=amount)
     for i, v in enumerate(damaged_vectors):
@@ -121,87 +118,77 @@ def damage_bits(binary_vectors: tuple, amount: int, show_annot: bool = False) ->
             idx = idxs.pop()
         else:
             continue
-        if show_annot:
-            print(f"У {i + 1} вектора набора инвертирую бит на позиции {idx + 1}")
+        say(annotation(show_annot, SUMMARY), f"У {i + 1} вектора набора инвертирую бит на позиции {idx + 1}")
         v[idx] = (v[idx] + 1) % 2
     damaged_vectors = tuple(damaged_vectors)
-    if show_annot:
-        print("\nРезультат:")
-        print("Было:\n")
-        pprint(binary_vectors)
-        print("Стало:\n")
-        pprint(damaged_vectors)
-        print("-----------------------------------------------")
+    say(at, "\nРезультат:")
+    show(at, "Было", binary_vectors)
+    show(at, "Стало", damaged_vectors)
+    say(at, "-----------------------------------------------")
     return damaged_vectors
 
 
 # Реализация кодирования целого слова
 def start_codding(C: Matrix, binary_vectors: tuple) -> tuple:
-    print("-----------------------------------------------")
-    print("Используем матрицу C для кодирования векторов.")
+    say(DETAIL, "-----------------------------------------------")
+    say(DETAIL, "Используем матрицу C для кодирования векторов.")
     coded_vectors = []
     for v in binary_vectors:
         u = Hamming(C.T, v)
         coded_vectors.append(u)
-    print("В результате получим следующий набор:\n")
-    pprint(tuple(coded_vectors))
-    print("-----------------------------------------------")
+    show(DETAIL, "В результате получим следующий набор", tuple(coded_vectors))
+    say(DETAIL, "-----------------------------------------------")
     return tuple(coded_vectors)
 
 # Использование матрицы H и поиск ошибок
 def get_sindroms(H: Matrix, binary_vectors: tuple, show_annot: bool = False) -> tuple:
-    if show_annot:
-        print("-----------------------------------------------")
-        print("Используем матрицу H для получения синдромов.")
+    at = annotation(show_annot)
+    say(at, "-----------------------------------------------")
+    say(at, "Используем матрицу H для получения синдромов.")
     decoded_vectors = []
     for u in binary_vectors:
         v = Hamming(H, u)
         decoded_vectors.append(v)
-    if show_annot:
-        print("В результате получим следующий набор синдромов:\n")
-        pprint(tuple(decoded_vectors))
-        print("-----------------------------------------------")
+    show(at, "В результате получим следующий набор синдромов", tuple(decoded_vectors))
+    say(at, "-----------------------------------------------")
     return tuple(decoded_vectors)
 
 
 def find_mistake_in_vectors(H: Matrix, binary_vectors: list) -> tuple:
-    print("-----------------------------------------------")
-    print("Проверим векторы на наличие ошибок в битах, умножив каждый на матрицу H и получив синдромы:\n")
+    say(DETAIL, "-----------------------------------------------")
+    say(DETAIL, "Проверим векторы на наличие ошибок в битах, умножив каждый на матрицу H и получив синдромы:")
     decoded_vectors = get_sindroms(H, binary_vectors)
-    print("Результат:\n")
-    pprint(decoded_vectors)
-    print()
+    show(DETAIL, "Результат", decoded_vectors)
+    say(DETAIL, "")
     error_idxs = []
     for i, v in enumerate(decoded_vectors):
         if not v.is_zero_matrix:
             binary_num = int(''.join(list((map(lambda x: str(x), v)))[::-1]), base=2)  # значения битов в матрице H идут в обратном порядке
             error_idxs.append((i, binary_num - 1))
-            print(f"Найдена ошибка в {i+1}-ом векторе набора. Неверный - {binary_num} бит.")
-    print("-----------------------------------------------")
+            say(SUMMARY, f"Найдена ошибка в {i+1}-ом векторе набора. Неверный - {binary_num} бит.")
+    say(DETAIL, "-----------------------------------------------")
     return tuple(error_idxs)
 
 
 def correction_vectors(binary_vectors: tuple, error_idxs: tuple) -> tuple:
-    print("-----------------------------------------------")
-    print("Исправим векторы:\n")
-    print("Исходный набор:\n")
-    pprint(binary_vectors)
-    print()
+    say(DETAIL, "-----------------------------------------------")
+    say(DETAIL, "Исправим векторы:")
+    show(DETAIL, "Исходный набор", binary_vectors)
+    say(DETAIL, "")
     binary_vectors = (binary_vectors[:])
     for i, j in error_idxs:
-        print(f"В {i+1}-ом векторе меняем {j+1} бит")
+        say(DETAIL, f"В {i+1}-ом векторе меняем {j+1} бит")
         binary_vectors[i][j] = (binary_vectors[i][j] + 1) % 2
-    print("\nИсправленный набор:\n")
-    pprint(binary_vectors)
-    print("\nПроверим, что всё верно исправлено, снова умножив на матрицу H:\n")
-    pprint(get_sindroms(H, damaged_vectors))
-    print("-----------------------------------------------\n")
+    show(DETAIL, "Исправленный набор", binary_vectors)
+    if enabled(DETAIL):  # проверочные синдромы считаются только для вывода
+        show(DETAIL, "Проверим, что всё верно исправлено, снова умножив на матрицу H", get_sindroms(H, damaged_vectors))
+    say(DETAIL, "-----------------------------------------------\n")
     return binary_vectors
 
 
 #  Зададим интересное слово из 4 букв:
 word = "КРЫМ"
-print("Выберем слово", word)
+say(SUMMARY, "Выберем слово", word)
 
 # C - матрица образов инф. битов и контрольн. битов
 C = Matrix([
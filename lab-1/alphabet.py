@@ -0,0 +1,87 @@
+import numpy as np
+
+
+alphabet_dict = {
+    'А': 0,
+    'Б': 1,
+    'В': 2,
+    'Г': 3,
+    'Д': 4,
+    'Е': 5,
+    'Ё': 6,
+    'Ж': 7,
+    'З': 8,
+    'И': 9,
+    'Й': 10,
+    'К': 11,
+    'Л': 12,
+    'М': 13,
+    'Н': 14,
+    'О': 15,
+    'П': 16,
+    'Р': 17,
+    'С': 18,
+    'Т': 19,
+    'У': 20,
+    'Ф': 21,
+    'Х': 22,
+    'Ц': 23,
+    'Ч': 24,
+    'Ш': 25,
+    'Щ': 26,
+    'Ы': 27,
+    'Э': 28,
+    'Ю': 29,
+    'Я': 30
+}
+
+reversed_alph_dict = dict(map(lambda x: x[::-1], alphabet_dict.items()))
+
+
+class AlphabetCodec:
+    """
+    Табличный перевод строк в коды букв и обратно за один проход.
+
+    encode: строка -> UTF-32 кодовые точки -> индекс в таблице кодов (uint8)
+    decode: коды -> индекс в таблице кодовых точек -> байты UTF-32 -> строка
+    Ни словаря на каждую букву, ни склейки строк в цикле.
+    """
+    UNKNOWN = 255  # код символа вне алфавита
+
+    def __init__(self, alphabet: dict):
+        codepoints = [ord(s) for s in alphabet]
+        if len(alphabet) >= self.UNKNOWN:
+            raise ValueError("Алфавит не помещается в uint8")
+
+        # последний элемент таблицы - ловушка для всех символов за её пределами
+        self._codes = np.full(max(codepoints) + 2, self.UNKNOWN, dtype=np.uint8)
+        self._codes[codepoints] = list(alphabet.values())
+
+        self._letters = np.zeros(len(alphabet), dtype='<u4')
+        self._letters[list(alphabet.values())] = codepoints
+
+    def __len__(self) -> int:
+        return len(self._letters)
+
+    def encode(self, word: str, skip_unknown: bool = False) -> np.ndarray:
+        """
+        Слово -> одномерный uint8 массив кодов.
+        Символ вне алфавита вызывает KeyError, как словарь alphabet_dict, или отбрасывается при skip_unknown=True.
+        """
+        codepoints = np.frombuffer(word.encode('utf-32-le'), dtype='<u4')
+        codes = self._codes[np.minimum(codepoints, self._codes.size - 1)]
+        unknown = codes == self.UNKNOWN
+        if unknown.any():
+            if skip_unknown:
+                return codes[~unknown]
+            raise KeyError(word[int(np.argmax(unknown))])
+        return codes
+
+    def decode(self, codes) -> str:  # массив кодов (любой формы) -> слово
+        codes = np.asarray(codes).reshape(-1)
+        if codes.size and (codes.min() < 0 or codes.max() >= len(self)):
+            raise KeyError(f"Код вне алфавита: {codes.max() if codes.max() >= len(self) else codes.min()}")
+        return self._letters[codes.astype(np.intp)].tobytes().decode('utf-32-le')
+
+
+codec = AlphabetCodec(alphabet_dict)
@@ -0,0 +1,137 @@
+import argparse
+import json
+import platform
+from time import perf_counter
+
+import numpy as np
+
+import hill
+from hill_codebook import Codebook, MAX_TABLE_BYTES
+from hill_recovery import recover_key_from_blocks
+from modular import inv_mod
+
+
+# Замеры шифра Хилла: текущий путь на sympy (поблочно, как в 1_Hill_Cipher.py / 2_Hill_hacking.py)
+# против движка на NumPy и кодовой книги для маленьких ключей.
+# Результаты пишутся в JSON, чтобы сравнивать прогоны между собой.
+SIZES = (2, 3, 4, 6, 8, 12, 16)
+LENGTHS = (12, 1_000, 100_000, 10_000_000)
+SYMPY_MAX_LETTERS = 10_000  # дальше поблочный sympy идёт минутами
+SYMPY_MAX_SIZE = 8
+SEED = 2025
+
+
+def sympy_encrypt(key, codes: np.ndarray) -> str:  # start_coding без вывода: по sympy-умножению на блок
+    from sympy import Matrix
+    key = Matrix(key)
+    n = key.shape[0]
+    close = [(key @ Matrix(codes[i:i + n])).applyfunc(lambda x: x % hill.MODULE) for i in range(0, codes.size // n * n, n)]
+    return hill.codec.decode([x for v in close for x in v])
+
+
+def sympy_decrypt(key, codes: np.ndarray) -> str:
+    from sympy import Matrix
+    return sympy_encrypt(Matrix(key).inv_mod(hill.MODULE), codes)
+
+
+def sympy_inverse(key):
+    from sympy import Matrix
+    return Matrix(key).inv_mod(hill.MODULE)
+
+
+def sympy_generate(size: int, rng: np.random.Generator):  # по одному кандидату с sympy-определителем, как generate_key
+    from sympy import Matrix
+    while True:
+        key = Matrix(rng.integers(0, hill.MODULE, size=(size, size)))
+        if key.det() % hill.MODULE != 0:
+            return key
+
+
+def sympy_recover(open_blocks: np.ndarray, close_blocks: np.ndarray, rng: np.random.Generator):  # случайные наборы блоков до обратимого P, как repair_key
+    from sympy import Matrix
+    n = open_blocks.shape[1]
+    while True:
+        idxs = rng.choice(open_blocks.shape[0], n, replace=False)
+        p = Matrix(open_blocks[idxs].T)
+        if p.det() % hill.MODULE != 0:
+            c = Matrix(close_blocks[idxs].T)
+            return (c @ p.inv_mod(hill.MODULE)).applyfunc(lambda x: x % hill.MODULE)
+
+
+def timed(func, *args, repeat: int = 3) -> float:  # лучшее время из repeat запусков
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        func(*args)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def run(sizes: tuple = SIZES, lengths: tuple = LENGTHS, sympy: bool = True, seed: int = SEED) -> dict:
+    rng = np.random.default_rng(seed)
+    records = []
+
+    def record(op, engine, size, length, seconds, items):
+        records.append({'op': op, 'engine': engine, 'key_size': size, 'length': length,
+                        'seconds': seconds, 'items_per_sec': items / seconds if seconds else None})
+
+    for size in sizes:
+        key = hill.generate_keys(1, size, rng=rng)[0][0]
+        with_sympy = sympy and size <= SYMPY_MAX_SIZE
+        with_codebook = hill.MODULE ** size * size <= MAX_TABLE_BYTES
+        if with_codebook:
+            book = Codebook(key)
+            record('codebook', 'codebook', size, None, timed(book.build, repeat=1), 1)
+
+        record('invert', 'numpy', size, None, timed(inv_mod, key, hill.MODULE), 1)
+        record('generate', 'numpy', size, None, timed(hill.generate_keys, 1000, size), 1000)
+        if with_sympy:
+            record('invert', 'sympy', size, None, timed(sympy_inverse, key), 1)
+            record('generate', 'sympy', size, None, timed(sympy_generate, size, rng), 1)
+
+        for length in lengths:
+            if length < size:
+                continue
+            codes = rng.integers(0, hill.MODULE, size=length).astype(np.uint8)
+            close = hill.codes_from_word(hill.start_coding(key, codes))
+            record('encrypt', 'numpy', size, length, timed(hill.start_coding, key, codes), length)
+            hill.key_cache.clear()  # обратный ключ считается в первом запуске, дальше берётся из кэша
+            record('decrypt', 'numpy', size, length, timed(hill.start_decoding, key, close), length)
+            if with_codebook:
+                record('encrypt', 'codebook', size, length, timed(book.start_coding, codes), length)
+                record('decrypt', 'codebook', size, length, timed(book.start_decoding, close), length)
+            if with_sympy and length <= SYMPY_MAX_LETTERS:
+                record('encrypt', 'sympy', size, length, timed(sympy_encrypt, key, codes, repeat=1), length)
+                record('decrypt', 'sympy', size, length, timed(sympy_decrypt, key, close, repeat=1), length)
+
+            if length >= size * size:
+                open_blocks, close_blocks = hill.make_blocks(codes, size), hill.make_blocks(close, size)
+                record('recover', 'numpy', size, length, timed(recover_key_from_blocks, open_blocks, close_blocks), 1)
+                if with_sympy and length <= SYMPY_MAX_LETTERS:
+                    record('recover', 'sympy', size, length, timed(sympy_recover, open_blocks, close_blocks, rng), 1)
+
+    environment = {'python': platform.python_version(), 'numpy': np.__version__,
+                   'machine': platform.machine(), 'system': platform.system()}
+    if sympy:
+        import sympy as sp
+        environment['sympy'] = sp.__version__
+    return {
+        'environment': environment,
+        'seed': seed,
+        'records': records,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Замеры шифра Хилла: sympy против NumPy')
+    parser.add_argument('output', nargs='?', default='bench_hill.json', help='куда записать JSON')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--lengths', type=int, nargs='+', default=LENGTHS)
+    parser.add_argument('--no-sympy', action='store_true', help='не замерять путь на sympy')
+    args = parser.parse_args()
+
+    result = run(tuple(args.sizes), tuple(args.lengths), not args.no_sympy)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    for r in result['records']:
+        print(f"{r['op']:>8} {r['engine']:>8} n={r['key_size']:<3} L={str(r['length']):<9} {r['seconds'] * 1000:10.3f} мс")
@@ -0,0 +1,158 @@
+from time import perf_counter
+
+import numpy as np
+
+from hill import MODULE, codes_from_word, make_blocks, word_from_codes
+
+
+# Циркулянтные ключи шифра Хилла: C[i, j] = c[(i - j) mod n], ключ задаётся одним столбцом c.
+# Умножение C @ v - это циклическая свёртка c и v, а в спектре теоретико-числового преобразования
+# (NTT, аналог Фурье над Z_p) - поэлементное произведение. Отсюда O(n log n) на блок и O(n) памяти на ключ.
+# Нужно простое p, у которого n делит p - 1 (есть корень из единицы степени n):
+#   p = 31 (алфавит) - n из 2, 3, 5, 6, 10, 15, 30;  p = 257 - n = 2^k <= 256;  p = 65537 - n = 2^k <= 65536.
+
+
+def prime_factors(m: int) -> list:
+    factors, d = [], 2
+    while d * d <= m:
+        if m % d == 0:
+            factors.append(d)
+            while m % d == 0:
+                m //= d
+        d += 1
+    if m > 1:
+        factors.append(m)
+    return factors
+
+
+def root_of_unity(n: int, p: int) -> int:
+    """Первообразный корень из единицы степени n по модулю простого p: w^n = 1, w^k != 1 при 0 < k < n."""
+    if (p - 1) % n:
+        raise ValueError(f"Длина {n} не делит {p} - 1, корня из единицы степени {n} по модулю {p} нет")
+    factors = prime_factors(p - 1)
+    for g in range(2, p):
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):  # g - образующая Z_p^*
+            return pow(g, (p - 1) // n, p)
+    return 1  # p = 2
+
+
+class NTT:
+    """
+    Прямое и обратное NTT длины n по модулю p сразу для пачки строк (B, n).
+    Для n = 2^k - итеративная бабочка Кули-Тьюки, O(n log n); иначе - умножение на матрицу ДПФ, O(n^2).
+    """
+
+    def __init__(self, n: int, p: int):
+        if p >= 2 ** 31:
+            raise ValueError("Модуль должен быть меньше 2^31, чтобы произведения помещались в int64")
+        self.n, self.p = n, p
+        self.root = root_of_unity(n, p)
+        self.inverse_root = pow(self.root, -1, p)
+        self.inverse_n = pow(n, -1, p)
+        self.radix2 = n & (n - 1) == 0
+        if self.radix2:
+            bits = max(n.bit_length() - 1, 0)
+            self.bit_reversed = np.array([int(format(i, f'0{bits}b')[::-1], 2) if bits else 0 for i in range(n)])
+        elif n * (p - 1) ** 2 >= 2 ** 63:
+            raise ValueError(f"Для длины {n}, не равной степени двойки, модуль {p} слишком велик")
+
+    def _powers(self, w: int, count: int) -> np.ndarray:  # 1, w, w^2, ... по модулю p
+        powers = np.ones(count, dtype=np.int64)
+        for i in range(1, count):
+            powers[i] = powers[i - 1] * w % self.p
+        return powers
+
+    def _transform(self, a: np.ndarray, root: int) -> np.ndarray:
+        a = np.asarray(a, dtype=np.int64).reshape(-1, self.n) % self.p
+        p, n = self.p, self.n
+        if not self.radix2:
+            dft = self._powers(root, n)[np.outer(np.arange(n), np.arange(n)) % n]
+            return a @ dft % p
+
+        a = a[:, self.bit_reversed]
+        size = 2
+        while size <= n:
+            half = size // 2
+            twiddles = self._powers(pow(root, n // size, p), half)
+            a = a.reshape(a.shape[0], n // size, size)
+            even, odd = a[..., :half], a[..., half:] * twiddles % p
+            a = np.concatenate(((even + odd) % p, (even - odd) % p), axis=-1)
+            size *= 2
+        return a.reshape(-1, n)
+
+    def forward(self, a: np.ndarray) -> np.ndarray:
+        return self._transform(a, self.root)
+
+    def inverse(self, a: np.ndarray) -> np.ndarray:
+        return self._transform(a, self.inverse_root) * self.inverse_n % self.p
+
+
+class CirculantKey:
+    """
+    Циркулянтный ключ с тем же API, что у обычного: encrypt_blocks / decrypt_blocks над (B, n)
+    и start_coding / start_decoding над сообщениями (только для p = 31, алфавита шифра).
+    Обратимость и обратный ключ считаются в спектре: C обратим, если все NTT(c)_k != 0,
+    а спектр обратного ключа - поэлементно обратные значения.
+
+    column: первый столбец c ключа
+    """
+
+    def __init__(self, column, p: int = MODULE):
+        self.column = np.asarray(column, dtype=np.int64) % p
+        self.n, self.p = self.column.size, p
+        self.ntt = NTT(self.n, p)
+        self.spectrum = self.ntt.forward(self.column)[0]
+        if np.any(self.spectrum == 0):
+            raise ValueError(f"Циркулянтный ключ необратим по модулю {p}: в спектре есть ноль")
+        self.inverse_spectrum = np.array([pow(int(x), -1, p) for x in self.spectrum], dtype=np.int64)
+
+    @classmethod
+    def random(cls, n: int, p: int = MODULE, rng: np.random.Generator = None) -> 'CirculantKey':
+        rng = np.random.default_rng() if rng is None else rng
+        ntt = NTT(n, p)  # ValueError сразу, если n не делит p - 1: подбором ключа это не исправить
+        while True:
+            column = rng.integers(0, p, size=n)
+            if np.all(ntt.forward(column) != 0):  # необратимые столбцы отбрасываем и тянем заново
+                return cls(column, p)
+
+    def inverse_column(self) -> np.ndarray:  # первый столбец обратного ключа, тоже циркулянта
+        return self.ntt.inverse(self.inverse_spectrum)[0]
+
+    def to_matrix(self, column: np.ndarray = None) -> np.ndarray:  # плотная матрица n x n, для проверки через Hill_cipher_blocks
+        column = self.column if column is None else column
+        idx = (np.arange(self.n)[:, None] - np.arange(self.n)[None, :]) % self.n
+        return column[idx]
+
+    def _apply(self, spectrum: np.ndarray, blocks: np.ndarray) -> np.ndarray:
+        return self.ntt.inverse(self.ntt.forward(blocks) * spectrum % self.p)
+
+    def encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:  # C @ v для каждой строки (B, n)
+        return self._apply(self.spectrum, blocks)
+
+    def decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:  # C^-1 @ v
+        return self._apply(self.inverse_spectrum, blocks)
+
+    def start_coding(self, p) -> str:  # как hill.start_coding
+        self._check_alphabet()
+        return word_from_codes(self.encrypt_blocks(make_blocks(p, self.n)))
+
+    def start_decoding(self, c) -> str:  # как hill.start_decoding
+        self._check_alphabet()
+        return word_from_codes(self.decrypt_blocks(make_blocks(c, self.n)))
+
+    def _check_alphabet(self):
+        if self.p != MODULE:
+            raise ValueError(f"Текстовый режим работает по модулю алфавита {MODULE}, у ключа модуль {self.p}")
+
+
+if __name__ == '__main__':
+    key = CirculantKey([3, 1, 4, 1, 5])
+    cipher_word = key.start_coding(codes_from_word('ПРОСТРАНСТВОВРЕМЯ'))
+    print('Зашифрованное сообщение:', cipher_word)
+    print('Расшифрованное сообщение:', key.start_decoding(codes_from_word(cipher_word)))
+
+    big = CirculantKey.random(4096, 65537, np.random.default_rng(0))
+    blocks = np.random.default_rng(1).integers(0, 65537, size=(256, 4096))
+    start = perf_counter()
+    assert np.array_equal(big.decrypt_blocks(big.encrypt_blocks(blocks)), blocks)
+    print(f"Ключ 4096x4096 по модулю 65537: {blocks.size / (perf_counter() - start) / 1e6:.1f} млн элементов/с туда и обратно")
@@ -0,0 +1,99 @@
+from time import perf_counter
+
+import numpy as np
+
+from hill import MODULE, Hill_cipher_blocks, prepare_key, generate_keys
+from parallel import pool_map
+from report import per_second
+
+
+CHUNK_TRIALS = 1 << 16  # испытаний на одну задачу пула
+
+
+def damage_codes(codes: np.ndarray, errors: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Векторное искажение пачки шифротекстов, аналог damage_cipher_word для (trials, L).
+    В каждой строке выбирается errors разных позиций, буква в них заменяется на другую (сдвиг 1..30).
+    """
+    trials, length = codes.shape
+    if errors == 0:
+        return codes.copy()
+    positions = np.argpartition(rng.random((trials, length)), errors - 1, axis=1)[:, :errors]
+    shifts = rng.integers(1, MODULE, size=(trials, errors))
+    damaged = codes.copy()
+    rows = np.arange(trials)[:, None]
+    damaged[rows, positions] = (damaged[rows, positions] + shifts) % MODULE
+    return damaged
+
+
+def _simulate_chunk(args: tuple) -> tuple:
+    """
+    Одна пачка испытаний: случайные открытые тексты -> шифр -> искажение -> дешифрование.
+    возвращает: (число ошибок на каждой позиции открытого текста, гистограмма числа ошибок на испытание)
+    """
+    key, inverse, length, errors, trials, seed = args
+    rng = np.random.default_rng(seed)
+    n = key.shape[0]
+    plain = rng.integers(0, MODULE, size=(trials * length // n, n))
+
+    close = Hill_cipher_blocks(key, plain).reshape(trials, length)
+    damaged = damage_codes(close, errors, rng).reshape(-1, n)
+    wrong = (Hill_cipher_blocks(inverse, damaged) != plain).reshape(trials, length)
+    return wrong.sum(axis=0), np.bincount(wrong.sum(axis=1), minlength=length + 1)
+
+
+def simulate(key, errors: int, trials: int = 1_000_000, length: int = 12, seed: int = None, workers: int = None) -> dict:
+    """
+    Монте-Карло распространения искажений: как errors заменённых букв шифротекста
+    портят расшифрованный текст. length должна делиться на размер ключа.
+
+    возвращает: доли ошибок по позициям текста и позициям в блоке, среднее число испорченных букв,
+                гистограмму числа испорченных букв, время и испытаний в секунду
+    """
+    prepared = prepare_key(key)
+    n = prepared.key.shape[0]
+    if length % n:
+        raise ValueError(f"Длина текста {length} не делится на размер ключа {n}")
+    if not 0 <= errors <= length:
+        raise ValueError(f"Число искажений должно быть от 0 до {length}")
+
+    sizes = [min(CHUNK_TRIALS, trials - start) for start in range(0, trials, CHUNK_TRIALS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(prepared.key, prepared.inverse, length, errors, size, s) for size, s in zip(sizes, seeds)]
+
+    started = perf_counter()
+    parts = list(pool_map(_simulate_chunk, tasks, workers))
+    seconds = perf_counter() - started
+
+    position_errors = sum(part[0] for part in parts)
+    histogram = sum(part[1] for part in parts)
+    position_rate = position_errors / trials
+    return {
+        'key_size': n,
+        'errors': errors,
+        'trials': trials,
+        'position_error_rate': position_rate,
+        'block_position_error_rate': position_rate.reshape(-1, n).mean(axis=0),
+        'wrong_letters_mean': float(position_errors.sum() / trials),
+        'wrong_letters_histogram': histogram,
+        'seconds': seconds,
+        'trials_per_sec': per_second(trials, seconds),
+    }
+
+
+def sweep(sizes: tuple = (2, 3, 4), errors: tuple = (1, 2, 3), trials: int = 1_000_000, length: int = 12,
+          seed: int = 0, workers: int = None) -> list:  # simulate для каждой пары (размер ключа, число искажений)
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in sizes:
+        key = generate_keys(1, size, rng=rng)[0][0]
+        for k in errors:
+            results.append(simulate(key, k, trials, length, seed, workers))
+    return results
+
+
+if __name__ == '__main__':
+    for result in sweep():
+        print(f"Ключ {result['key_size']}x{result['key_size']}, искажений {result['errors']}: "
+              f"в среднем испорчено {result['wrong_letters_mean']:.2f} букв, "
+              f"{result['trials_per_sec']:.0f} испытаний/с")
@@ -0,0 +1,128 @@
+import sys
+from time import perf_counter
+
+import numpy as np
+
+
+# Код Хэмминга (7, 4) из 3_Hamming_code.py на массивах NumPy.
+# Четыре информационных бита (полубайт) хранятся в одном uint8 значением 0..15, кодовое слово - значением 0..127;
+# первый бит вектора - старший. Матрицы те же, что и в 3_Hamming_code.py: u = C^T v, s = H u, v = R u.
+HAMMING_ALL_BITS, HAMMING_INFO_BIT = 7, 4
+LETTER_BITS = 5
+
+C = np.array([
+    [1, 1, 1, 0, 0, 0, 0],
+    [1, 0, 0, 1, 1, 0, 0],
+    [0, 1, 0, 1, 0, 1, 0],
+    [1, 1, 0, 1, 0, 0, 1]
+], dtype=np.uint8)
+
+H = np.array([
+    [1, 0, 1, 0, 1, 0, 1],
+    [0, 1, 1, 0, 0, 1, 1],
+    [0, 0, 0, 1, 1, 1, 1]
+], dtype=np.uint8)
+
+R = np.array([
+    [0, 0, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 0],
+    [0, 0, 0, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0, 0, 1]
+], dtype=np.uint8)
+
+# Буквы в порядке их 5-битных кодов из BINARY_MATCH: А - 00000, ..., Я - 11111 (Ё в словаре нет)
+LETTERS = 'АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
+LETTER_CODES = np.full(0x110000, 255, dtype=np.uint8)  # как в AlphabetCodec: код символа -> номер буквы
+LETTER_CODES[[ord(s) for s in LETTERS]] = np.arange(len(LETTERS), dtype=np.uint8)
+
+
+def bits_to_ints(bits: np.ndarray) -> np.ndarray:  # (..., k) биты, первый - старший -> (...) uint8
+    weights = 1 << np.arange(bits.shape[-1] - 1, -1, -1)
+    return (bits.astype(np.int64) @ weights).astype(np.uint8)
+
+
+def ints_to_bits(values: np.ndarray, width: int) -> np.ndarray:  # (...) -> (..., width) биты, первый - старший
+    return (np.asarray(values, dtype=np.uint8)[..., None] >> np.arange(width - 1, -1, -1, dtype=np.uint8)) & 1
+
+
+# Таблицы строятся один раз из C, H и R:
+#   CODEWORDS[v]       - кодовое слово полубайта v (C^T v по модулю 2), 16 значений
+#   H_COLUMNS[j]       - синдром ошибки в бите j: столбец H, прочитанный от младшего бита, как в find_mistake_in_vectors
+#   ERROR_POSITION[s]  - номер испорченного бита по синдрому s, -1 для нулевого синдрома, 8 значений
+#   FLIP_MASK[s]       - что прибавить по модулю 2 к кодовому слову с синдромом s, чтобы его исправить
+#   DATA_POSITIONS     - какие биты кодового слова выбирает R
+# и по ним - таблицы на все 128 значений кодового слова u, так что декодирование - две выборки:
+#   SYNDROMES[u]       - синдром H u
+#   CODEWORD_FIX[u]    - исправленное кодовое слово u ^ FLIP_MASK[H u]
+#   DATA[u]            - полубайт R u
+CODEWORDS = bits_to_ints(ints_to_bits(np.arange(2 ** HAMMING_INFO_BIT), HAMMING_INFO_BIT) @ C % 2)
+H_COLUMNS = (H.T.astype(np.int64) @ (1 << np.arange(H.shape[0]))).astype(np.uint8)
+ERROR_POSITION = np.full(2 ** H.shape[0], -1, dtype=np.int8)
+ERROR_POSITION[H_COLUMNS] = np.arange(HAMMING_ALL_BITS)
+FLIP_MASK = np.zeros(2 ** H.shape[0], dtype=np.uint8)
+FLIP_MASK[H_COLUMNS] = 1 << (HAMMING_ALL_BITS - 1 - np.arange(HAMMING_ALL_BITS))
+DATA_POSITIONS = np.argmax(R, axis=1)
+
+_ALL_WORDS = ints_to_bits(np.arange(2 ** HAMMING_ALL_BITS), HAMMING_ALL_BITS)  # (128, 7), строка - биты u
+SYNDROMES = np.bitwise_xor.reduce(_ALL_WORDS * H_COLUMNS, axis=1)  # XOR столбцов H при единичных битах
+CODEWORD_FIX = np.arange(2 ** HAMMING_ALL_BITS, dtype=np.uint8) ^ FLIP_MASK[SYNDROMES]
+DATA = bits_to_ints(_ALL_WORDS[:, DATA_POSITIONS])
+
+
+def encode(nibbles: np.ndarray) -> np.ndarray:  # полубайты (N,) -> кодовые слова (N,), одна выборка из таблицы
+    return CODEWORDS[nibbles]
+
+
+def syndromes(codewords: np.ndarray) -> np.ndarray:  # синдромы H u, (N,) uint8 0..7, выборкой из таблицы
+    return SYNDROMES[codewords]
+
+
+def correct(codewords: np.ndarray) -> np.ndarray:  # исправляет одну ошибку в каждом кодовом слове
+    return CODEWORD_FIX[codewords]
+
+
+def extract(codewords: np.ndarray) -> np.ndarray:  # информационные биты R u, без умножения на R
+    return DATA[codewords]
+
+
+def decode(codewords: np.ndarray) -> np.ndarray:  # исправление и извлечение полубайтов: две выборки подряд
+    return DATA[CODEWORD_FIX[codewords]]
+
+
+def nibbles_from_word(word: str) -> np.ndarray:
+    """
+    Слово -> полубайты, как binarization и translate_to_binary_vectors: 5 бит на букву, пачки по 4 бита.
+    Число букв должно делиться на 4, иначе биты не делятся на пачки (KeyError для букв не из словаря).
+    """
+    codes = LETTER_CODES[np.frombuffer(word.encode('utf-32-le'), dtype=np.uint32)]
+    if np.any(codes == 255):
+        raise KeyError(next(s for s, c in zip(word, codes) if c == 255))
+    bits = ints_to_bits(codes, LETTER_BITS).reshape(-1)
+    if bits.size % HAMMING_INFO_BIT:
+        raise ValueError(f"Число бит {bits.size} не делится на {HAMMING_INFO_BIT}")
+    return bits_to_ints(bits.reshape(-1, HAMMING_INFO_BIT))
+
+
+def word_from_nibbles(nibbles: np.ndarray) -> str:  # обратное к nibbles_from_word, как translate_to_word
+    bits = ints_to_bits(nibbles, HAMMING_INFO_BIT).reshape(-1)
+    return ''.join(LETTERS[c] for c in bits_to_ints(bits.reshape(-1, LETTER_BITS)))
+
+
+if __name__ == '__main__':
+    word = sys.argv[1] if len(sys.argv) > 1 else 'КРЫМ'
+    codewords = encode(nibbles_from_word(word))
+    rng = np.random.default_rng()
+    damaged = codewords ^ (1 << rng.integers(0, HAMMING_ALL_BITS, size=codewords.size)).astype(np.uint8)
+    print('Кодовые слова:', ' '.join(format(u, '07b') for u in codewords))
+    print('Искажённые:   ', ' '.join(format(u, '07b') for u in damaged))
+    print('Ошибки в битах:', (ERROR_POSITION[syndromes(damaged)] + 1).tolist())
+    print('Восстановленное слово:', word_from_nibbles(decode(damaged)))
+
+    nibbles = rng.integers(0, 16, size=10_000_000, dtype=np.uint8)
+    start = perf_counter()
+    codewords = encode(nibbles)
+    damaged = codewords ^ (1 << rng.integers(0, HAMMING_ALL_BITS, size=codewords.size)).astype(np.uint8)
+    middle = perf_counter()
+    assert np.array_equal(decode(damaged), nibbles)
+    print(f"{nibbles.size / 1e6:.0f} млн полубайтов: кодирование с искажением {middle - start:.2f} с, "
+          f"исправление и декодирование {perf_counter() - middle:.2f} с")
@@ -0,0 +1,156 @@
+import sys
+from time import perf_counter
+
+import numpy as np
+
+import hamming
+from hamming import C, H, DATA_POSITIONS, HAMMING_ALL_BITS, HAMMING_INFO_BIT
+
+
+# Код Хэмминга (7, 4) в побитовой раскладке (bit-slicing): 64 кодовых слова идут параллельно,
+# по одному в каждом разряде uint64. Группа из 64 полубайтов - это 4 слова uint64 (плоскости),
+# плоскость i хранит i-й бит всех 64 полубайтов; кодовые слова группы - 7 плоскостей.
+# Тогда один XOR плоскостей считает бит чётности сразу для 64 кодовых слов, а синдромы
+# и исправление - это XOR и AND плоскостей, без распаковки в отдельные биты.
+#
+# Формат: открытые байты читаются как подряд идущие группы по 4 слова '<u8' (32 байта на 64 полубайта),
+# закодированные - группы по 7 слов (56 байт). Длина открытых данных дополняется до 32 байт как в PKCS#7.
+GROUP_BYTES = HAMMING_INFO_BIT * 8
+WORD = np.dtype('<u8')
+
+# Структура чётности из матриц C и H:
+#   ENCODE_TERMS[j]   - какие плоскости данных складываются в j-ю плоскость кодового слова (столбец j матрицы C)
+#   SYNDROME_TERMS[k] - какие плоскости кодового слова складываются в k-ю плоскость синдрома (строка k матрицы H)
+ENCODE_TERMS = [np.flatnonzero(C[:, j]).tolist() for j in range(HAMMING_ALL_BITS)]
+SYNDROME_TERMS = [np.flatnonzero(H[k]).tolist() for k in range(H.shape[0])]
+
+
+def _xor(planes: np.ndarray, terms: list) -> np.ndarray:  # XOR выбранных плоскостей (G, k) -> (G,)
+    result = planes[:, terms[0]].copy()
+    for t in terms[1:]:
+        result ^= planes[:, t]
+    return result
+
+
+def pad(payload: bytes) -> np.ndarray:  # дополнение q байтами q до целого числа групп -> плоскости данных (G, 4)
+    q = GROUP_BYTES - len(payload) % GROUP_BYTES
+    data = np.frombuffer(payload + bytes([q]) * q, dtype=np.uint8)
+    return data.view(WORD).reshape(-1, HAMMING_INFO_BIT)
+
+
+def unpad(planes: np.ndarray) -> bytes:
+    data = planes.astype(WORD, copy=False).tobytes()
+    q = data[-1] if data else 0
+    if not 1 <= q <= GROUP_BYTES or data[-q:] != bytes([q]) * q:
+        raise ValueError("Повреждено дополнение: данные исправить не удалось или это не закодированный поток")
+    return data[:-q]
+
+
+def encode_planes(data: np.ndarray) -> np.ndarray:  # плоскости данных (G, 4) -> плоскости кодовых слов (G, 7)
+    coded = np.empty((data.shape[0], HAMMING_ALL_BITS), dtype=WORD)
+    for j, terms in enumerate(ENCODE_TERMS):
+        coded[:, j] = _xor(data, terms)
+    return coded
+
+
+def syndrome_planes(coded: np.ndarray) -> np.ndarray:  # (G, 7) -> (G, 3): k-й бит синдрома для 64 слов в каждом элементе
+    return np.stack([_xor(coded, terms) for terms in SYNDROME_TERMS], axis=1)
+
+
+def error_mask(syndromes: np.ndarray, position: int) -> np.ndarray:
+    """Разряды (кодовые слова), у которых синдром равен столбцу H для бита position: AND плоскостей синдрома или их отрицаний."""
+    mask = None
+    for k in range(H.shape[0]):
+        plane = syndromes[:, k] if H[k, position] else ~syndromes[:, k]
+        mask = plane if mask is None else mask & plane
+    return mask
+
+
+def decode_planes(coded: np.ndarray) -> np.ndarray:  # (G, 7) -> исправленные плоскости данных (G, 4)
+    syndromes = syndrome_planes(coded)
+    data = coded[:, DATA_POSITIONS]  # копия: исправляем только биты, которые выбирает R
+    for i, position in enumerate(DATA_POSITIONS.tolist()):
+        data[:, i] ^= error_mask(syndromes, position)
+    return data
+
+
+def encode_bytes(payload: bytes) -> bytes:
+    return encode_planes(pad(payload)).tobytes()
+
+
+def coded_planes(encoded: bytes) -> np.ndarray:  # закодированные байты -> плоскости (G, 7), без копирования
+    if len(encoded) % (HAMMING_ALL_BITS * 8):
+        raise ValueError(f"Длина закодированных данных {len(encoded)} не кратна {HAMMING_ALL_BITS * 8} байтам")
+    return np.frombuffer(encoded, dtype=WORD).reshape(-1, HAMMING_ALL_BITS)
+
+
+def decode_bytes(encoded: bytes) -> bytes:  # исправляет по одной ошибке в каждом кодовом слове и снимает дополнение
+    return unpad(decode_planes(coded_planes(encoded)))
+
+
+def errors_found(encoded: bytes) -> int:  # число кодовых слов с ненулевым синдромом
+    syndromes = syndrome_planes(coded_planes(encoded))
+    return int(np.unpackbits(np.bitwise_or.reduce(syndromes, axis=1).view(np.uint8)).sum())
+
+
+def flip_one_bit_per_word(encoded: bytes, rng: np.random.Generator) -> bytes:
+    """Искажает в каждом кодовом слове один случайный бит (для проверки и замеров)."""
+    coded = coded_planes(encoded).copy()
+    positions = rng.integers(0, HAMMING_ALL_BITS, size=(coded.shape[0], 64))
+    lanes = np.uint64(1) << np.arange(64, dtype=np.uint64)
+    for j in range(HAMMING_ALL_BITS):
+        coded[:, j] ^= np.bitwise_or.reduce(np.where(positions == j, lanes, np.uint64(0)), axis=1)
+    return coded.tobytes()
+
+
+def table_encode(payload: bytes) -> np.ndarray:  # тот же поток через табличный hamming.py: полубайт - uint8, старший первым
+    data = np.frombuffer(payload, dtype=np.uint8)
+    return hamming.encode(np.stack((data >> 4, data & 15), axis=1).reshape(-1))
+
+
+def table_decode(codewords: np.ndarray) -> bytes:
+    nibbles = hamming.decode(codewords).reshape(-1, 2)
+    return ((nibbles[:, 0] << 4) | nibbles[:, 1]).tobytes()
+
+
+def benchmark(size: int = 1 << 24, seed: int = 0) -> dict:
+    """
+    Побитовый движок против табличного на size случайных байт с одной ошибкой в каждом кодовом слове.
+    возвращает: байт в секунду для кодирования и декодирования и размер закодированных данных у обоих
+    """
+    rng = np.random.default_rng(seed)
+    payload = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+
+    start = perf_counter()
+    encoded = encode_bytes(payload)
+    sliced_encode = perf_counter() - start
+    damaged = flip_one_bit_per_word(encoded, rng)
+    start = perf_counter()
+    assert decode_bytes(damaged) == payload
+    sliced_decode = perf_counter() - start
+
+    start = perf_counter()
+    codewords = table_encode(payload)
+    table_encode_time = perf_counter() - start
+    damaged = codewords ^ (1 << rng.integers(0, HAMMING_ALL_BITS, size=codewords.size)).astype(np.uint8)
+    start = perf_counter()
+    assert table_decode(damaged) == payload
+    table_decode_time = perf_counter() - start
+
+    return {
+        'bytes': size,
+        'bitslice': {'encode_bytes_per_sec': size / sliced_encode, 'decode_bytes_per_sec': size / sliced_decode,
+                     'encoded_bytes': len(encoded)},
+        'table': {'encode_bytes_per_sec': size / table_encode_time, 'decode_bytes_per_sec': size / table_decode_time,
+                  'encoded_bytes': codewords.nbytes},
+    }
+
+
+if __name__ == '__main__':
+    result = benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 24)
+    print(f"{result['bytes'] / 2 ** 20:.0f} МБ данных, по одной ошибке в каждом кодовом слове:")
+    for engine in ('bitslice', 'table'):
+        r = result[engine]
+        print(f"{engine:>9}: кодирование {r['encode_bytes_per_sec'] / 2 ** 20:7.1f} МБ/с, "
+              f"декодирование {r['decode_bytes_per_sec'] / 2 ** 20:7.1f} МБ/с, "
+              f"закодировано {r['encoded_bytes'] / 2 ** 20:.1f} МБ")
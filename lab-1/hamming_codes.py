@@ -0,0 +1,175 @@
+import sys
+from time import perf_counter
+
+import numpy as np
+
+
+# Коды Хэмминга (2^r - 1, 2^r - 1 - r) для любого r с матрицами, построенными автоматически.
+# Биты кодового слова нумеруются с единицы; столбец j матрицы H - двоичная запись j (младший разряд
+# в первой строке), как в 3_Hamming_code.py. Поэтому синдром, прочитанный как число, - это сразу номер
+# испорченного бита, контрольные биты стоят на местах 1, 2, 4, ..., а информационные - на остальных.
+# При r = 3 получаются в точности C, H и R из 3_Hamming_code.py.
+#
+# Расширенный код (SECDED) добавляет в конец бит общей чётности: одна ошибка исправляется,
+# две - обнаруживаются (синдром ненулевой, а общая чётность сошлась).
+# Кодовые слова хранятся по биту на байт, (N, n) uint8; для хранения есть упаковка в байты.
+LENGTH_HEADER = np.dtype('<u8')  # в encode_bytes: длина данных перед ними, чтобы снять дополнение нулями
+
+OK, CORRECTED, DOUBLE_ERROR = 0, 1, 2  # результаты check
+
+
+class HammingCode:
+    """
+    Код Хэмминга с параметром r (r >= 2): длина n = 2^r - 1, информационных бит k = n - r.
+    extended=True - вариант SECDED длины n + 1.
+
+    Матрицы (по модулю 2): generator (k, length) - кодовое слово = data @ generator,
+    parity_check (r или r + 1, length) - синдром = parity_check @ u, decoder (k, length) - data = decoder @ u.
+    Сами кодирование и декодирование обходятся без умножений на них: см. encode и syndromes.
+    """
+
+    def __init__(self, r: int, extended: bool = False):
+        if r < 2:
+            raise ValueError("Код Хэмминга определён для r >= 2")
+        self.r, self.extended = r, extended
+        self.n = 2 ** r - 1
+        self.k = self.n - r
+        self.length = self.n + int(extended)
+        positions = np.arange(1, self.n + 1)
+        self.parity_positions = 2 ** np.arange(r) - 1  # индексы с нуля
+        self.data_positions = np.flatnonzero(positions & (positions - 1))  # номер не степень двойки
+        self.position_numbers = positions.astype(np.uint32)
+
+    @property
+    def rate(self) -> float:
+        return self.k / self.length
+
+    @property
+    def parity_check(self) -> np.ndarray:
+        h = ((np.arange(1, self.n + 1)[None, :] >> np.arange(self.r)[:, None]) & 1).astype(np.uint8)
+        if self.extended:
+            h = np.vstack((np.hstack((h, np.zeros((self.r, 1), dtype=np.uint8))), np.ones((1, self.length), dtype=np.uint8)))
+        return h
+
+    @property
+    def generator(self) -> np.ndarray:  # строки - кодовые слова единичных векторов данных
+        return self.encode(np.eye(self.k, dtype=np.uint8))
+
+    @property
+    def decoder(self) -> np.ndarray:  # выбирает информационные биты, как R
+        decoder = np.zeros((self.k, self.length), dtype=np.uint8)
+        decoder[np.arange(self.k), self.data_positions] = 1
+        return decoder
+
+    def _position_syndromes(self, codewords: np.ndarray) -> np.ndarray:  # XOR номеров единичных битов первых n разрядов
+        return np.bitwise_xor.reduce(np.where(codewords[:, :self.n] != 0, self.position_numbers, 0), axis=1)
+
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        """
+        data: (N, k) биты -> (N, length) кодовые слова.
+        Данные раскладываются по своим местам, их синдром и есть набор контрольных битов:
+        бит b синдрома ставится на место 2^b.
+        """
+        data = np.asarray(data, dtype=np.uint8).reshape(-1, self.k)
+        codewords = np.zeros((data.shape[0], self.length), dtype=np.uint8)
+        codewords[:, self.data_positions] = data
+        syndrome = self._position_syndromes(codewords)
+        codewords[:, self.parity_positions] = (syndrome[:, None] >> np.arange(self.r)) & 1
+        if self.extended:
+            codewords[:, self.n] = np.bitwise_xor.reduce(codewords[:, :self.n], axis=1)
+        return codewords
+
+    def syndromes(self, codewords: np.ndarray) -> np.ndarray:
+        """
+        Синдромы кодовых слов (N,): номер испорченного бита (с единицы) или 0.
+        У расширенного кода к номеру добавлен старший бит - общая чётность, как последняя строка parity_check.
+        """
+        codewords = np.asarray(codewords, dtype=np.uint8).reshape(-1, self.length)
+        syndrome = self._position_syndromes(codewords)
+        if self.extended:
+            parity = np.bitwise_xor.reduce(codewords, axis=1).astype(syndrome.dtype)
+            syndrome = syndrome | (parity << self.r)
+        return syndrome
+
+    def check(self, codewords: np.ndarray) -> np.ndarray:
+        """Для каждого слова: OK, CORRECTED (одна ошибка, исправима) или DOUBLE_ERROR (только у расширенного кода)."""
+        syndrome = self.syndromes(codewords)
+        if not self.extended:
+            return np.where(syndrome != 0, CORRECTED, OK).astype(np.uint8)
+        position, parity = syndrome & ((1 << self.r) - 1), syndrome >> self.r
+        return np.select([parity == 1, position != 0], [CORRECTED, DOUBLE_ERROR], OK).astype(np.uint8)
+
+    def correct(self, codewords: np.ndarray) -> np.ndarray:
+        """
+        Исправляет по одной ошибке в каждом слове. Слова с двумя ошибками (DOUBLE_ERROR) у расширенного
+        кода остаются как есть - их можно найти через check.
+        """
+        codewords = np.array(codewords, dtype=np.uint8).reshape(-1, self.length)
+        syndrome = self.syndromes(codewords)
+        position = (syndrome & ((1 << self.r) - 1)).astype(np.int64)
+        if self.extended:
+            parity = (syndrome >> self.r) == 1
+            rows = np.flatnonzero(parity)  # одна ошибка: в бите position или, при position = 0, в бите чётности
+            columns = np.where(position[rows] != 0, position[rows] - 1, self.n)
+        else:
+            rows = np.flatnonzero(position)
+            columns = position[rows] - 1
+        codewords[rows, columns] ^= 1
+        return codewords
+
+    def extract(self, codewords: np.ndarray) -> np.ndarray:  # информационные биты выборкой по data_positions
+        return np.asarray(codewords, dtype=np.uint8).reshape(-1, self.length)[:, self.data_positions]
+
+    def decode(self, codewords: np.ndarray) -> np.ndarray:
+        return self.extract(self.correct(codewords))
+
+    def encode_bytes(self, payload: bytes) -> bytes:
+        """Байты -> упакованные кодовые слова. Впереди 8 байт длины, хвост дополняется нулями до k бит."""
+        data = np.frombuffer(np.array([len(payload)], dtype=LENGTH_HEADER).tobytes() + payload, dtype=np.uint8)
+        bits = np.unpackbits(data)
+        bits = np.concatenate((bits, np.zeros(-bits.size % self.k, dtype=np.uint8)))
+        return np.packbits(self.encode(bits.reshape(-1, self.k))).tobytes()
+
+    def decode_bytes(self, encoded: bytes) -> bytes:
+        bits = np.unpackbits(np.frombuffer(encoded, dtype=np.uint8))
+        count = bits.size // self.length
+        data = np.packbits(self.decode(bits[:count * self.length].reshape(count, self.length))).tobytes()
+        size = int(np.frombuffer(data[:LENGTH_HEADER.itemsize], dtype=LENGTH_HEADER)[0])
+        if size > len(data) - LENGTH_HEADER.itemsize:
+            raise ValueError("Повреждена длина данных: слишком много ошибок или это не закодированный поток")
+        return data[LENGTH_HEADER.itemsize:LENGTH_HEADER.itemsize + size]
+
+    def __repr__(self) -> str:
+        return f"HammingCode({self.length}, {self.k}{', SECDED' if self.extended else ''})"
+
+
+def flip_bits(codewords: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:  # count разных битов в каждом слове
+    codewords = np.array(codewords, dtype=np.uint8)
+    order = np.argsort(rng.random(codewords.shape), axis=1)[:, :count]
+    codewords[np.arange(codewords.shape[0])[:, None], order] ^= 1
+    return codewords
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20
+    rng = np.random.default_rng(0)
+    payload = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    for r in (3, 4, 6, 8):
+        for extended in (False, True):
+            code = HammingCode(r, extended)
+            start = perf_counter()
+            encoded = code.encode_bytes(payload)
+            middle = perf_counter()
+            assert code.decode_bytes(encoded) == payload
+            seconds = perf_counter() - middle
+            print(f"{str(code):>24}: скорость кода {code.rate:.1%}, на байт данных {len(encoded) / size - 1:.3f} байта "
+                  f"избыточности, кодирование {size / (middle - start) / 2 ** 20:.1f} МБ/с, "
+                  f"декодирование {size / seconds / 2 ** 20:.1f} МБ/с")
+
+    code = HammingCode(6, extended=True)
+    codewords = code.encode(rng.integers(0, 2, size=(100_000, code.k)))
+    for errors in (1, 2):
+        damaged = flip_bits(codewords, errors, rng)
+        found = np.bincount(code.check(damaged), minlength=3)
+        print(f"{code}, {errors} ошибки в слове: исправимы {found[CORRECTED]}, обнаружены двойные {found[DOUBLE_ERROR]}, "
+              f"восстановлено верно {np.all(code.correct(damaged) == codewords, axis=1).sum()}")
@@ -0,0 +1,229 @@
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from alphabet import alphabet_dict, codec
+from modular import det_mod, inv_mod, matmul_mod
+from report import annotation, show
+
+
+MODULE = len(alphabet_dict)
+BLAS_MIN_SIZE = 16  # с такого размера ключа целочисленный matmul медленнее matmul_mod через float64 BLAS
+
+
+def gcd(a, b):  # Алгоритм Евклида
+    while b != 0:
+        a, b = b, a % b
+    return a
+
+
+def to_array(m) -> np.ndarray:  # sympy Matrix / список / массив -> целочисленный массив NumPy
+    return np.array(m, dtype=np.int64)
+
+
+def codes_from_word(word: str) -> np.ndarray:  # слово -> одномерный uint8 массив кодов букв
+    return codec.encode(word)
+
+
+def word_from_codes(codes: np.ndarray) -> str:  # массив кодов (любой формы) -> слово
+    return codec.decode(codes)
+
+
+def make_blocks(v, length: int) -> np.ndarray:
+    """
+    Делит вектор-сообщение на блоки длины length.
+    Как и make_subvectors, отбрасывает хвост короче length.
+
+    v: sympy Matrix-столбец, список или массив кодов
+    возвращает: (blocks, length) массив, i-я строка - i-й подвектор; для массива - view без копии
+    """
+    codes = v.reshape(-1) if isinstance(v, np.ndarray) else to_array(v).reshape(-1)  # массив не копируем
+    count = codes.size // length
+    return codes[:count * length].reshape(count, length)
+
+
+def _needs_matmul_mod(n: int, mod: int) -> bool:  # большой ключ или сумма n произведений может переполнить int64
+    return n >= BLAS_MIN_SIZE or n * (mod - 1) ** 2 >= 2 ** 63
+
+
+def Hill_cipher_blocks(key: np.ndarray, blocks: np.ndarray, mod: int = MODULE) -> np.ndarray:
+    """
+    Шифр Хилла сразу для всех блоков: одно умножение и одно взятие по модулю.
+    Строки blocks - подвектора v, поэтому (K @ v)^T = v^T @ K^T.
+    Большие ключи (и ключи, на которых сумма в int64 переполнится) идут через matmul_mod.
+    """
+    key = to_array(key)
+    if _needs_matmul_mod(key.shape[-1], mod):
+        return matmul_mod(blocks, key.T, mod)
+    return (blocks @ key.T) % mod
+
+
+def inverse_key(key, mod: int = MODULE) -> np.ndarray:  # обратный по модулю ключ
+    return inv_mod(to_array(key), mod)
+
+
+def generate_keys(count: int, size: int, mod: int = MODULE, rng: np.random.Generator = None) -> tuple:
+    """
+    Пачка случайных обратимых по модулю mod ключей size x size.
+    Кандидаты равномерно выбираются пачками, вырожденные (det = 0 mod mod) отбрасываются,
+    поэтому ключи равномерно распределены среди всех обратимых. mod - простое.
+
+    возвращает: (ключи (count, size, size), доля принятых кандидатов); при count <= 0 - (пустой массив, nan)
+    """
+    if count <= 0:  # кандидатов не тянем, доля принятых не определена
+        return np.empty((0, size, size), dtype=np.int64), float('nan')
+    rng = np.random.default_rng() if rng is None else rng
+    keys = []
+    accepted = drawn = 0
+    while accepted < count:
+        rate = accepted / drawn if drawn else 1 - 1 / mod  # оценка доли обратимых по уже увиденным кандидатам
+        batch = int((count - accepted) / max(rate, 0.01) * 1.1) + 1
+        candidates = rng.integers(0, mod, size=(batch, size, size), dtype=np.int64)
+        good = candidates[det_mod(candidates, mod) != 0]
+        keys.append(good)
+        accepted += good.shape[0]
+        drawn += batch
+    return np.concatenate(keys)[:count], accepted / drawn
+
+
+class PreparedKey(NamedTuple):  # ключ вместе с посчитанными обратным ключом и определителем
+    key: np.ndarray
+    inverse: np.ndarray
+    det: int
+
+
+class KeyCache:
+    """
+    LRU кэш обратных ключей. Ключом кэша служит содержимое матрицы (форма + байты),
+    поэтому повторное дешифрование тем же ключом не считает обратную матрицу заново.
+
+    maxsize: сколько ключей хранить, самый давно использованный вытесняется
+    """
+
+    def __init__(self, maxsize: int = 128, mod: int = MODULE):
+        if maxsize < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.maxsize = maxsize
+        self.mod = mod
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._keys = OrderedDict()
+
+    def get(self, key) -> PreparedKey:
+        key = to_array(key)
+        cache_key = (key.shape, key.tobytes())
+        prepared = self._keys.get(cache_key)
+        if prepared is not None:
+            self.hits += 1
+            self._keys.move_to_end(cache_key)
+            return prepared
+
+        self.misses += 1
+        det = int(det_mod(key, self.mod))
+        if gcd(det, self.mod) != 1:
+            raise ValueError(f"Ключ необратим по модулю {self.mod}: det = {det}")
+        key.setflags(write=False)
+        inverse = inverse_key(key, self.mod)
+        inverse.setflags(write=False)
+        prepared = PreparedKey(key, inverse, det)
+
+        self._keys[cache_key] = prepared
+        if len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+            self.evictions += 1
+        return prepared
+
+    def stats(self) -> dict:
+        return {'size': len(self._keys), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def clear(self):
+        self._keys.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+key_cache = KeyCache()
+
+
+def prepare_key(key) -> PreparedKey:  # ключ с обратным из общего кэша
+    return key_cache.get(key)
+
+
+def start_coding(key, p, show_annot: bool = False) -> str:  # Кодирование сообщения p ключом key, те же аргументы, что и в 1_Hill_Cipher.py
+    key = to_array(key)
+    open_blocks = make_blocks(p, key.shape[1])
+    close_blocks = Hill_cipher_blocks(key, open_blocks)
+    at = annotation(show_annot)
+    show(at, 'Векторы - сообщение', lambda: list(open_blocks))
+    show(at, 'Ключ', key)
+    show(at, 'Зашифрованные вектора - сообщение', lambda: list(close_blocks))
+    return word_from_codes(close_blocks)
+
+
+def start_decoding(key, c, show_annot: bool = False) -> str:  # Декодирование сообщения c ключом key
+    reversed_key = prepare_key(key).inverse
+    close_blocks = make_blocks(c, reversed_key.shape[1])
+    open_blocks = Hill_cipher_blocks(reversed_key, close_blocks)
+    at = annotation(show_annot)
+    show(at, 'Векторы - сообщение', lambda: list(close_blocks))
+    show(at, 'Обратный ключ', reversed_key)
+    show(at, 'Расшифрованные вектора - сообщение', lambda: list(open_blocks))
+    return word_from_codes(open_blocks)
+
+
+def Hill_cipher_keys(keys: np.ndarray, blocks: np.ndarray, mod: int = MODULE) -> np.ndarray:
+    """
+    Шифр Хилла для стопки ключей одной операцией.
+
+    keys: (k, n, n) ключи одного размера
+    blocks: (B, n) блоки сообщений
+    возвращает: (k, B, n) - uint8 при mod <= 256, иначе int64; [i] - блоки, зашифрованные i-м ключом
+    """
+    keys = to_array(keys)
+    count, n = keys.shape[0], keys.shape[-1]
+    # ключи кладём рядом: (n, k*n), тогда все ключи - одно двумерное умножение (B, n) @ (n, k*n)
+    stacked = keys.transpose(2, 0, 1).reshape(n, count * n)
+    if _needs_matmul_mod(n, mod):
+        close = matmul_mod(to_array(blocks), stacked, mod)
+    else:
+        close = to_array(blocks) @ stacked
+        close %= mod
+    if mod <= 256:
+        close = close.astype(np.uint8)
+    return close.reshape(-1, count, n).transpose(1, 0, 2)
+
+
+def _join_messages(messages: list, length: int) -> tuple:  # все сообщения -> общий массив блоков и границы сообщений в буквах
+    codes = [make_blocks(codes_from_word(m), length).reshape(-1) for m in messages]
+    bounds = np.cumsum([0] + [c.size for c in codes])
+    return np.concatenate(codes).reshape(-1, length), bounds
+
+
+def _split_messages(close_blocks: np.ndarray, bounds: np.ndarray) -> list:  # (k, B, n) -> [ключ][сообщение] строки
+    text = word_from_codes(close_blocks)  # одна строка на все ключи и сообщения
+    total = int(bounds[-1])
+    return [[text[i * total + a:i * total + b] for a, b in zip(bounds[:-1], bounds[1:])]
+            for i in range(close_blocks.shape[0])]
+
+
+def start_coding_many(keys, messages: list) -> list:
+    """
+    Кодирование пачки сообщений стопкой ключей: все блоки всех сообщений шифруются всеми ключами разом.
+    Хвост каждого сообщения короче размера ключа отбрасывается, как в start_coding.
+    возвращает: result[i][j] - j-е сообщение, зашифрованное i-м ключом
+    """
+    keys = to_array(keys)
+    if not messages:
+        return [[] for _ in keys]
+    blocks, bounds = _join_messages(messages, keys.shape[-1])
+    return _split_messages(Hill_cipher_keys(keys, blocks), bounds)
+
+
+def start_decoding_many(keys, messages: list) -> list:  # обратная к start_coding_many, обратные ключи берутся из кэша
+    reversed_keys = np.stack([prepare_key(key).inverse for key in keys])
+    if not messages:
+        return [[] for _ in reversed_keys]
+    blocks, bounds = _join_messages(messages, reversed_keys.shape[-1])
+    return _split_messages(Hill_cipher_keys(reversed_keys, blocks), bounds)
@@ -0,0 +1,192 @@
+from itertools import combinations, permutations
+from time import perf_counter
+
+import numpy as np
+
+from alphabet import alphabet_dict
+from hill import MODULE, Hill_cipher_keys, codes_from_word, make_blocks
+from modular import det_mod, inv_mod
+from parallel import pool_map
+from report import per_second
+
+
+# Частоты букв русского языка, %. Ъ и Ь в алфавит шифра не входят.
+LETTER_FREQUENCIES = {
+    'А': 8.01, 'Б': 1.59, 'В': 4.54, 'Г': 1.70, 'Д': 2.98, 'Е': 8.45, 'Ё': 0.04, 'Ж': 0.94,
+    'З': 1.65, 'И': 7.35, 'Й': 1.21, 'К': 3.49, 'Л': 4.40, 'М': 3.21, 'Н': 6.70, 'О': 10.97,
+    'П': 2.81, 'Р': 4.73, 'С': 5.47, 'Т': 6.26, 'У': 2.62, 'Ф': 0.26, 'Х': 0.97, 'Ц': 0.48,
+    'Ч': 1.44, 'Ш': 0.73, 'Щ': 0.36, 'Ы': 1.90, 'Э': 0.32, 'Ю': 0.64, 'Я': 2.01
+}
+
+LETTER_LOG_PROBS = np.zeros(len(alphabet_dict))
+LETTER_LOG_PROBS[[alphabet_dict[s] for s in LETTER_FREQUENCIES]] = np.log(
+    np.array(list(LETTER_FREQUENCIES.values())) / sum(LETTER_FREQUENCIES.values()))
+
+# Самые частые биграммы русского текста (приблизительно, % от всех пар соседних букв).
+# Остальным парам достаётся оставшаяся доля пропорционально P(a) P(b) по частотам букв.
+BIGRAM_FREQUENCIES = {
+    'СТ': 1.75, 'НО': 1.32, 'НА': 1.26, 'ТО': 1.25, 'ЕН': 1.23, 'ОВ': 1.08, 'НИ': 1.06, 'РА': 1.05,
+    'ВО': 1.00, 'КО': 0.98, 'ЕР': 0.92, 'ПР': 0.91, 'АЛ': 0.87, 'ОС': 0.85, 'ЕТ': 0.83, 'ОЛ': 0.81,
+    'ОР': 0.80, 'НЕ': 0.80, 'ЛИ': 0.78, 'ТА': 0.76, 'ОМ': 0.74, 'РЕ': 0.73, 'ЛЕ': 0.72, 'ПО': 0.72,
+    'ВА': 0.70, 'ГО': 0.70, 'ЕЛ': 0.66, 'КА': 0.65, 'ТЕ': 0.65, 'ОД': 0.63, 'АН': 0.62, 'ЕС': 0.61,
+    'ЛА': 0.60, 'ОТ': 0.60, 'ИЕ': 0.56, 'ЕМ': 0.55, 'ИТ': 0.54, 'ОН': 0.54, 'РО': 0.53, 'ВЕ': 0.52,
+}
+
+CHUNK_ELEMENTS = 1 << 22  # сколько букв расшифровок держим в памяти за раз
+
+
+def _bigram_log_probs() -> np.ndarray:  # (31 * 31,) log P(ab), индекс a * 31 + b
+    letters = np.exp(LETTER_LOG_PROBS)
+    probs = np.outer(letters, letters)
+    known = np.zeros_like(probs, dtype=bool)
+    for pair, frequency in BIGRAM_FREQUENCIES.items():
+        a, b = alphabet_dict[pair[0]], alphabet_dict[pair[1]]
+        probs[a, b], known[a, b] = frequency / 100, True
+    probs[~known] *= (1 - probs[known].sum()) / probs[~known].sum()
+    return np.log(probs).reshape(-1)
+
+
+BIGRAM_LOG_PROBS = _bigram_log_probs()
+
+
+def unigram_score(plain: np.ndarray) -> np.ndarray:
+    """
+    Оценка правдоподобия расшифровок по частотам букв.
+    plain: (k, B, n) коды букв k расшифровок
+    возвращает: (k,) сумма логарифмов вероятностей букв
+    """
+    return LETTER_LOG_PROBS[plain].sum(axis=(1, 2))
+
+
+def bigram_score(plain: np.ndarray) -> np.ndarray:
+    """
+    Оценка расшифровок по частотам пар соседних букв - в отличие от unigram_score, различает порядок букв.
+    plain: (k, B, n) коды букв k расшифровок
+    возвращает: (k,) сумма логарифмов вероятностей биграмм
+    """
+    text = np.asarray(plain, dtype=np.intp).reshape(len(plain), -1)
+    return BIGRAM_LOG_PROBS[text[:, :-1] * len(alphabet_dict) + text[:, 1:]].sum(axis=1)
+
+
+def best_with_ties(scores: np.ndarray, top: int) -> np.ndarray:
+    """Индексы top лучших оценок по убыванию и всех, что делят с последней из них одну оценку."""
+    order = np.argsort(-scores, kind='stable')
+    if order.size <= top:
+        return order
+    cutoff = scores[order[top - 1]]
+    return order[scores[order] >= cutoff - 1e-9 * abs(cutoff)]
+
+
+def digits(indices: np.ndarray, count: int, mod: int = MODULE) -> np.ndarray:  # номер -> count цифр номера по основанию mod
+    return indices[:, None] // mod ** np.arange(count, dtype=np.int64) % mod
+
+
+def keys_from_indices(indices: np.ndarray, size: int, mod: int = MODULE) -> np.ndarray:  # номер -> матрица size x size
+    return digits(indices, size * size, mod).reshape(-1, size, size)
+
+
+def _attack_chunk(args: tuple) -> tuple:
+    """
+    Перебор одного диапазона номеров матриц дешифрования D = K^-1.
+    Вырожденные D отбрасываются, остальные расшифровывают весь текст разом и оцениваются.
+    возвращает: (оценки лучших, номера лучших, число перебранных обратимых)
+    """
+    start, stop, blocks, size, top, score = args
+    indices = np.arange(start, stop, dtype=np.int64)
+    candidates = keys_from_indices(indices, size)
+    invertible = det_mod(candidates, MODULE) != 0
+    candidates, indices = candidates[invertible], indices[invertible]
+
+    scores = score(Hill_cipher_keys(candidates, blocks))
+    if scores.size > top:
+        best = np.argpartition(-scores, top)[:top]
+        scores, indices = scores[best], indices[best]
+    return scores, indices, int(invertible.sum())
+
+
+def brute_force(cipher_word: str, size: int = 2, top: int = 5, score=unigram_score, workers: int = None) -> tuple:
+    """
+    Атака только по шифротексту: полный перебор всех обратимых ключей size x size.
+    Перебираются матрицы дешифрования кусками, куски раздаются пулу процессов.
+    Число кандидатов 31^(size^2): 2x2 - около 923 тыс., 3x3 - 2.6 * 10^13, поэтому size >= 3 - ValueError,
+    для таких ключей есть row_attack.
+
+    score: функция (k, B, n) -> (k,), больше - правдоподобнее. Частоты букв не различают ключи,
+           отличающиеся перестановкой строк (буквы внутри блока просто меняются местами), -
+           такие ключи получают одинаковую оценку и идут в выдаче рядом
+    workers: число процессов, 1 - без пула
+    возвращает: ([(оценка, ключ), ...] по убыванию оценки, статистика)
+    """
+    if size >= 3:
+        raise ValueError(f"Полный перебор ключей {size}x{size} - {MODULE ** (size * size):.1e} кандидатов, используйте row_attack")
+    blocks = make_blocks(codes_from_word(cipher_word), size)
+    total = MODULE ** (size * size)
+    chunk = max(1, CHUNK_ELEMENTS // max(1, blocks.size))
+    tasks = ((start, min(start + chunk, total), blocks, size, top, score) for start in range(0, total, chunk))
+
+    started = perf_counter()
+    parts = list(pool_map(_attack_chunk, tasks, workers))
+    seconds = perf_counter() - started
+
+    scores = np.concatenate([part[0] for part in parts])
+    indices = np.concatenate([part[1] for part in parts])
+    tried = sum(part[2] for part in parts)
+    order = np.argsort(-scores)[:top]
+    decrypt_keys = keys_from_indices(indices[order], size)
+    results = [(float(scores[i]), inv_mod(d, MODULE)) for i, d in zip(order, decrypt_keys)]
+    stats = {'tried': tried, 'seconds': seconds, 'keys_per_sec': per_second(tried, seconds)}
+    return results, stats
+
+
+def score_rows(blocks: np.ndarray, letter_log_probs: np.ndarray = LETTER_LOG_PROBS) -> np.ndarray:
+    """
+    Оценка всех 31^n строк матрицы дешифрования по отдельности.
+    Строка d даёт одну и ту же позицию открытого текста каждого блока: d . c mod 31,
+    поэтому по частотам букв её можно проверить без остальных строк.
+
+    blocks: (B, n) блоки шифротекста
+    возвращает: (31^n,) оценки, индекс - номер строки (цифры по основанию 31)
+    """
+    size = blocks.shape[1]
+    total = MODULE ** size
+    chunk = max(1, CHUNK_ELEMENTS // max(1, blocks.shape[0]))
+    scores = np.empty(total)
+    for start in range(0, total, chunk):
+        rows = digits(np.arange(start, min(start + chunk, total), dtype=np.int64), size)
+        plain = rows @ blocks.T % MODULE
+        scores[start:start + rows.shape[0]] = letter_log_probs[plain].sum(axis=1)
+    return scores
+
+
+def row_attack(cipher_word: str, size: int, top_rows: int = None, top: int = 5, score=bigram_score) -> tuple:
+    """
+    Атака только по шифротексту "по строкам": вместо 31^(n^2) ключей перебираются 31^n строк.
+    1) каждая строка матрицы дешифрования оценивается по частотам букв своей позиции;
+    2) из top_rows лучших строк собираются все упорядоченные наборы по n строк, вырожденные отбрасываются;
+    3) полученные матрицы расшифровывают текст целиком и ранжируются функцией score.
+    Порядок строк частоты букв не различают, поэтому score должна учитывать соседние буквы:
+    bigram_score или NgramModel. Кандидаты с одинаковой оценкой на границе top не отсекаются,
+    и выдача может быть длиннее top.
+
+    возвращает: ([(оценка, ключ), ...] по убыванию оценки, статистика), как у brute_force
+    """
+    blocks = make_blocks(codes_from_word(cipher_word), size)
+    top_rows = size + 3 if top_rows is None else top_rows
+
+    started = perf_counter()
+    row_scores = score_rows(blocks)
+    row_scores[0] = -np.inf  # нулевая строка не бывает в обратимой матрице
+    best_rows = np.argsort(-row_scores)[:top_rows]
+    rows = digits(best_rows, size)
+
+    choices = [order for group in combinations(range(top_rows), size) for order in permutations(group)]
+    candidates = rows[np.array(choices)]
+    candidates = candidates[det_mod(candidates, MODULE) != 0]
+    scores = score(Hill_cipher_keys(candidates, blocks))
+    seconds = perf_counter() - started
+
+    order = best_with_ties(scores, top)
+    results = [(float(scores[i]), inv_mod(candidates[i], MODULE)) for i in order]
+    tried = MODULE ** size + candidates.shape[0]
+    stats = {'tried': tried, 'seconds': seconds, 'keys_per_sec': per_second(tried, seconds)}
+    return results, stats
@@ -0,0 +1,129 @@
+import mmap
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from hill import Hill_cipher_blocks, to_array
+from modular import det_mod, inv_mod, inv_mod_power
+from report import per_second
+
+
+# Байтовый режим шифра Хилла: те же key @ v mod m, но над произвольными двоичными данными.
+# Z_256: шифротекст тех же размеров (байт -> байт), ключ обратим, если det нечётен.
+# Z_257: поле, но результат занимает 0..256, поэтому шифротекст хранится по 2 байта на символ.
+MODULI = {256: np.dtype(np.uint8), 257: np.dtype('<u2')}  # модуль -> тип символа шифротекста
+CHUNK_BLOCKS = 1 << 16  # сколько блоков обрабатываем за раз
+
+
+def check_modulus(mod: int):
+    if mod not in MODULI:
+        raise ValueError(f"Байтовый режим поддерживает модули {tuple(MODULI)}, получено {mod}")
+
+
+def is_invertible(keys, mod: int) -> np.ndarray:  # обратимость одного ключа или стопки (k, n, n)
+    check_modulus(mod)
+    keys = to_array(keys)
+    if mod == 256:
+        return det_mod(keys % 2, 2) != 0
+    return det_mod(keys, mod) != 0
+
+
+def inverse_byte_key(key, mod: int) -> np.ndarray:
+    check_modulus(mod)
+    if mod == 256:
+        return inv_mod_power(key, 2, 8)
+    return inv_mod(key, mod)
+
+
+def generate_byte_key(size: int, mod: int = 256, rng: np.random.Generator = None) -> np.ndarray:  # случайный обратимый по модулю mod ключ
+    rng = np.random.default_rng() if rng is None else rng
+    while True:
+        candidates = rng.integers(0, mod, size=(16, size, size), dtype=np.int64)
+        good = candidates[is_invertible(candidates, mod)]
+        if good.shape[0]:
+            return good[0]
+
+
+def mapped(path: str, dtype=np.uint8) -> np.ndarray:
+    """
+    Файл, отображённый в память и видимый как массив NumPy через np.frombuffer - без копирования.
+    Отображение живёт, пока жив массив или его срезы, и освобождается вместе с ними.
+    Пустой файл отображать нельзя, для него отдаётся пустой массив.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return np.empty(0, dtype=dtype)
+        return np.frombuffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), dtype=dtype)
+
+
+def _report(size: int, seconds: float) -> dict:
+    return {'bytes': size, 'seconds': seconds, 'mb_per_sec': per_second(size / 1e6, seconds)}
+
+
+def encrypt_bytes_file(key, src: str, dst: str, mod: int = 256, chunk_blocks: int = CHUNK_BLOCKS) -> dict:
+    """
+    Шифрует произвольный файл блоками по n байт и потоком пишет результат.
+    Хвост дополняется как в PKCS#7: q байтов со значением q (1 <= q <= n), поэтому n < 256.
+    возвращает: размер исходного файла, время и МБ/с
+    """
+    key = to_array(key)
+    n = key.shape[0]
+    if n >= 256:
+        raise ValueError("Размер блока должен быть меньше 256 байт")
+    if not is_invertible(key, mod):
+        raise ValueError(f"Ключ необратим по модулю {mod}")
+
+    started = perf_counter()
+    out_type = MODULI[mod]
+    data = mapped(src)
+    with open(dst, 'wb') as out:
+        full = data.size // n * n
+        step = chunk_blocks * n
+        for start in range(0, full, step):
+            blocks = data[start:min(start + step, full)].reshape(-1, n)
+            out.write(Hill_cipher_blocks(key, blocks, mod).astype(out_type).tobytes())
+        q = n - (data.size - full)
+        last = np.concatenate((data[full:], np.full(q, q, dtype=np.uint8))).reshape(1, n)
+        out.write(Hill_cipher_blocks(key, last, mod).astype(out_type).tobytes())
+    return _report(data.size, perf_counter() - started)
+
+
+def decrypt_bytes_file(key, src: str, dst: str, mod: int = 256, chunk_blocks: int = CHUNK_BLOCKS) -> dict:
+    """
+    Расшифровка файла encrypt_bytes_file с тем же ключом и модулем, дополнение снимается.
+    возвращает: размер расшифрованного файла, время и МБ/с
+    """
+    inverse = inverse_byte_key(key, mod)
+    n = inverse.shape[0]
+
+    started = perf_counter()
+    data = mapped(src, MODULI[mod])
+    with open(dst, 'wb') as out:
+        if data.size == 0 or data.size % n:
+            raise ValueError(f"Длина шифротекста {data.size} не кратна блоку {n}")
+        step = chunk_blocks * n
+        size = 0
+        for start in range(0, data.size, step):
+            plain = Hill_cipher_blocks(inverse, data[start:start + step].reshape(-1, n), mod).reshape(-1)
+            if start + step >= data.size:  # последний кусок: проверяем и снимаем дополнение
+                q = int(plain[-1])
+                if not 1 <= q <= n or np.any(plain[plain.size - q:] != q):
+                    raise ValueError("Повреждённое дополнение: неверный ключ или шифротекст")
+                plain = plain[:plain.size - q]
+            if np.any(plain > 255):
+                raise ValueError("Символ вне диапазона байта: неверный ключ или шифротекст")
+            out.write(plain.astype(np.uint8).tobytes())
+            size += plain.size
+    return _report(size, perf_counter() - started)
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else 'lab-1/word.txt'
+    for mod in MODULI:
+        key = generate_byte_key(8, mod)
+        stats = encrypt_bytes_file(key, path, path + '.hill', mod)
+        print(f"Z_{mod}: зашифровано {stats['bytes']} байт, {stats['mb_per_sec']:.1f} МБ/с")
+        stats = decrypt_bytes_file(key, path + '.hill', path + '.open', mod)
+        print(f"Z_{mod}: расшифровано {stats['bytes']} байт, {stats['mb_per_sec']:.1f} МБ/с")
@@ -0,0 +1,83 @@
+import numpy as np
+
+from hill import MODULE, Hill_cipher_blocks, codes_from_word, make_blocks, prepare_key, word_from_codes
+
+
+MAX_TABLE_BYTES = 1 << 24  # 16 МБ на таблицу: ключи 2x2 (3 КБ), 3x3 (90 КБ), 4x4 (3.7 МБ)
+
+
+def block_indices(blocks: np.ndarray, mod: int = MODULE) -> np.ndarray:
+    """
+    Блок -> его номер: число с цифрами блока по основанию mod, по схеме Горнера.
+    Поэлементные сложения в int32 заметно дешевле целочисленного matmul.
+    """
+    n = blocks.shape[1]
+    indices = blocks[:, 0].astype(np.int32 if mod ** n < 2 ** 31 else np.int64)
+    for j in range(1, n):
+        indices *= mod
+        indices += blocks[:, j]
+    return indices
+
+
+def all_blocks(n: int, mod: int = MODULE) -> np.ndarray:  # все mod^n блоков по порядку номеров, (mod^n, n)
+    indices = np.arange(mod ** n, dtype=np.int64)
+    return (indices[:, None] // mod ** np.arange(n - 1, -1, -1, dtype=np.int64) % mod).astype(np.uint8)
+
+
+class Codebook:
+    """
+    Режим кодовой книги для маленьких ключей: K @ v один раз считается для всех 31^n блоков,
+    а потом шифрование - это выборка строки таблицы по номеру блока, без умножений.
+    Таблицы строятся лениво при первом обращении; таблица расшифровки получается обращением
+    перестановки номеров, обратный ключ для неё не нужен.
+
+    max_bytes: предел памяти на одну таблицу, для ключей крупнее - ValueError
+    """
+
+    def __init__(self, key, max_bytes: int = MAX_TABLE_BYTES):
+        self.key = prepare_key(key).key
+        self.n = self.key.shape[0]
+        self.table_bytes = MODULE ** self.n * self.n
+        if self.table_bytes > max_bytes:
+            raise ValueError(f"Кодовая книга для ключа {self.n}x{self.n} заняла бы {self.table_bytes} байт "
+                             f"при пределе {max_bytes}")
+        self._encrypt_table = None
+        self._decrypt_table = None
+
+    def build(self):  # построить обе таблицы сразу (иначе они строятся при первом обращении)
+        plain = all_blocks(self.n)
+        close = Hill_cipher_blocks(self.key, plain).astype(np.uint8)
+        self._encrypt_table = close
+        self._decrypt_table = np.empty_like(plain)
+        self._decrypt_table[block_indices(close)] = plain  # номер шифроблока -> открытый блок
+
+    @property
+    def encrypt_table(self) -> np.ndarray:
+        if self._encrypt_table is None:
+            self.build()
+        return self._encrypt_table
+
+    @property
+    def decrypt_table(self) -> np.ndarray:
+        if self._decrypt_table is None:
+            self.build()
+        return self._decrypt_table
+
+    def encrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:  # (B, n) -> (B, n) uint8
+        return np.take(self.encrypt_table, block_indices(blocks), axis=0)
+
+    def decrypt_blocks(self, blocks: np.ndarray) -> np.ndarray:
+        return np.take(self.decrypt_table, block_indices(blocks), axis=0)
+
+    def start_coding(self, p) -> str:  # как hill.start_coding
+        return word_from_codes(self.encrypt_blocks(make_blocks(p, self.n)))
+
+    def start_decoding(self, c) -> str:  # как hill.start_decoding
+        return word_from_codes(self.decrypt_blocks(make_blocks(c, self.n)))
+
+
+if __name__ == '__main__':
+    book = Codebook([[11, 27], [20, 23]])
+    cipher_word = book.start_coding(codes_from_word('ПРОСТРАНСТВО'))
+    print('Зашифрованное сообщение:', cipher_word)
+    print('Расшифрованное сообщение:', book.start_decoding(codes_from_word(cipher_word)))
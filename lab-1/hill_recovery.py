@@ -0,0 +1,235 @@
+import json
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from hill import MODULE, Hill_cipher_blocks, codes_from_word, generate_keys, make_blocks, word_from_codes
+from modular import det_mod, solve_mod, solve_mod_batch
+from parallel import pool_map
+from report import per_second
+
+
+# Массовое восстановление ключей по дампу перехвата: JSON по строке на запись,
+#   {"id": 17, "open": "...", "close": "...", "size": 3}      (id необязателен, по умолчанию - номер строки)
+# В выходной файл по строке на запись: {"id": 17, "key": [[...]]} или {"id": 17, "error": "..."}.
+BATCH_RECORDS = 2048  # записей одного размера ключа в одной пачке для процесса
+SOLVE_BLOCKS = 2  # в пачке берём до SOLVE_BLOCKS * n первых блоков записи: n для решения, остальные для проверки
+
+
+def select_independent_blocks(blocks: np.ndarray, mod: int = MODULE) -> list:
+    """
+    Детерминированно выбирает n линейно независимых по модулю mod блоков из (B, n).
+    Блоки просматриваются по порядку, каждый приводится по уже набранному базису (пошаговый Гаусс);
+    ненулевой остаток даёт новый ведущий столбец. Время не больше O(B * n^2), без случайных повторов.
+
+    возвращает: индексы n выбранных блоков
+    """
+    n = blocks.shape[1]
+    basis = []  # (ведущий столбец, строка с единицей в нём)
+    chosen = []
+    for i, block in enumerate(np.asarray(blocks, dtype=np.int64)):
+        v = block % mod
+        for col, row in basis:
+            v = (v - v[col] * row) % mod
+        nonzero = np.flatnonzero(v)
+        if nonzero.size == 0:
+            continue
+        col = nonzero[0]
+        basis.append((col, v * pow(int(v[col]), -1, mod) % mod))
+        chosen.append(i)
+        if len(chosen) == n:
+            return chosen
+    raise ValueError(f"В сообщении только {len(chosen)} независимых блоков из {n} нужных")
+
+
+def recover_key_from_blocks(open_blocks: np.ndarray, close_blocks: np.ndarray, mod: int = MODULE) -> np.ndarray:
+    """
+    Ключ по парам блоков (открытый, зашифрованный): K P = C, где в столбцах P и C - выбранные блоки.
+    Одна система P^T K^T = C^T решается Гауссом по модулю.
+    """
+    count = min(open_blocks.shape[0], close_blocks.shape[0])
+    idxs = select_independent_blocks(open_blocks[:count], mod)
+    return solve_mod(open_blocks[idxs], close_blocks[idxs], mod).T
+
+
+def recover_key(open_word: str, close_word: str, key_size: int) -> np.ndarray:  # ключ любого размера по известной паре слов
+    open_blocks = make_blocks(codes_from_word(open_word), key_size)
+    close_blocks = make_blocks(codes_from_word(close_word), key_size)
+    return recover_key_from_blocks(open_blocks, close_blocks)
+
+
+def _recover_batch(args: tuple) -> list:
+    """
+    Пачка записей с одним размером ключа n: все системы P^T K^T = C^T решаются одним solve_mod_batch.
+    Записи, у которых среди первых блоков не нашлось n независимых, досчитываются по одной
+    recover_key_from_blocks по всему сообщению. Найденный ключ проверяется на всех блоках записи.
+    возвращает: [(id, ключ или None, причина неудачи или None), ...]
+    """
+    ids, opens, closes, n = args
+    results = [None] * len(ids)
+    parsed = []  # (номер в пачке, блоки открытого, блоки шифротекста)
+    for i, (open_word, close_word) in enumerate(zip(opens, closes)):
+        try:
+            o = make_blocks(codes_from_word(open_word), n)
+            c = make_blocks(codes_from_word(close_word), n)
+        except KeyError as e:
+            results[i] = (ids[i], None, f"символ {e} не из алфавита")
+            continue
+        count = min(o.shape[0], c.shape[0])
+        if count < n:
+            results[i] = (ids[i], None, f"блоков {count}, а нужно хотя бы {n}")
+            continue
+        parsed.append((i, o[:count], c[:count]))
+    if not parsed:  # память и время solve_mod_batch - только под записи, в которых хватает блоков
+        return results
+
+    rows = SOLVE_BLOCKS * n
+    open_blocks = np.zeros((len(parsed), rows, n), dtype=np.uint8)
+    close_blocks = np.zeros_like(open_blocks)
+    for j, (_, o, c) in enumerate(parsed):
+        used = min(o.shape[0], rows)
+        open_blocks[j, :used], close_blocks[j, :used] = o[:used], c[:used]
+
+    solved, full_rank, consistent = solve_mod_batch(open_blocks, close_blocks, MODULE)
+    keys = solved.transpose(0, 2, 1)
+    dets = det_mod(keys, MODULE)
+    for j, (i, o, c) in enumerate(parsed):
+        key = keys[j]
+        if not full_rank[j]:
+            try:
+                key = recover_key_from_blocks(o, c)
+            except ValueError as e:
+                results[i] = (ids[i], None, str(e))
+                continue
+            consistent_i = np.array_equal(Hill_cipher_blocks(key, o), c)
+            det = int(det_mod(key, MODULE))
+        else:
+            det = dets[j]
+            # solve_mod_batch проверил только первые SOLVE_BLOCKS * n блоков, остальные - здесь
+            consistent_i = consistent[j] and (o.shape[0] <= rows or np.array_equal(Hill_cipher_blocks(key, o), c))
+        if not consistent_i:
+            results[i] = (ids[i], None, f"пара не шифруется ни одним ключом {n}x{n}")
+        elif det == 0:
+            results[i] = (ids[i], None, "восстановленный ключ вырожден")
+        else:
+            results[i] = (ids[i], key.tolist(), None)
+    return results
+
+
+def read_dump(path: str):
+    """
+    Записи дампа по одной: (id, открытый текст, шифротекст, размер ключа, причина неудачи).
+    Испорченная запись не останавливает чтение: у неё причина - строка, остальные поля None.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f):
+            if not line.strip():
+                continue
+            record_id = line_number
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("запись должна быть JSON-объектом")
+                record_id = record.get('id', line_number)
+                open_word, close_word, size = record['open'], record['close'], record['size']
+                if not isinstance(open_word, str) or not isinstance(close_word, str):
+                    raise ValueError("тексты должны быть строками")
+                if not isinstance(size, int) or isinstance(size, bool):  # 2.9 или "3" не округляем и не разбираем
+                    raise ValueError(f"размер ключа должен быть целым числом, получено {size!r}")
+                if size < 1:
+                    raise ValueError(f"размер ключа должен быть положительным, получено {size}")
+            except KeyError as e:
+                yield record_id, None, None, None, f"нет поля {e}"
+            except (ValueError, TypeError) as e:  # JSONDecodeError - тоже ValueError
+                yield record_id, None, None, None, str(e)
+            else:
+                yield record_id, open_word, close_word, size, None
+
+
+def _valid(records, failed: list):  # пропускает дальше только разобранные записи, неудачи складывает в failed
+    for record_id, open_word, close_word, size, error in records:
+        if error is None:
+            yield record_id, open_word, close_word, size
+        else:
+            failed.append((record_id, None, error))
+
+
+def _batches(records, batch_size: int):  # группирует поток записей по размеру ключа в пачки для _recover_batch
+    groups = {}
+    for record_id, open_word, close_word, size in records:
+        ids, opens, closes = groups.setdefault(size, ([], [], []))
+        ids.append(record_id)
+        opens.append(open_word)
+        closes.append(close_word)
+        if len(ids) == batch_size:
+            yield groups.pop(size) + (size,)
+    for size, group in groups.items():
+        yield group + (size,)
+
+
+def recover_dump(dump_path: str, output_path: str, workers: int = None, batch_size: int = BATCH_RECORDS) -> dict:
+    """
+    Восстанавливает ключи всех записей дампа. Дамп читается потоком, пачки раздаются через pool_map,
+    так что память не зависит от размера дампа.
+    Порядок строк в выходном файле не совпадает с дампом (записи сгруппированы по размеру ключа), сопоставлять по id.
+
+    workers: число процессов, 1 - без пула
+    возвращает: статистику - записей, восстановлено, неудач, время и записей в секунду
+    """
+    stats = {'records': 0, 'recovered': 0, 'failed': 0}
+
+    def write(results, out):
+        for record_id, key, error in results:
+            stats['records'] += 1
+            if error is None:
+                stats['recovered'] += 1
+                out.write(json.dumps({'id': record_id, 'key': key}) + '\n')
+            else:
+                stats['failed'] += 1
+                out.write(json.dumps({'id': record_id, 'error': error}, ensure_ascii=False) + '\n')
+
+    started = perf_counter()
+    failed = []  # неразобранные записи, пишутся по ходу чтения
+    batches = _batches(_valid(read_dump(dump_path), failed), batch_size)
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for results in pool_map(_recover_batch, batches, workers):
+            write(results, out)
+            write(failed, out)
+            failed.clear()
+        write(failed, out)
+    seconds = perf_counter() - started
+    stats['seconds'] = seconds
+    stats['records_per_sec'] = per_second(stats['records'], seconds)
+    return stats
+
+
+def make_dump(path: str, count: int, sizes: tuple = (2, 3, 4), length: int = 48, seed: int = None) -> int:
+    """
+    Синтетический дамп перехвата для проверки и замеров: count записей со случайными ключами
+    размеров из sizes и случайными открытыми текстами длины length.
+    возвращает: число записанных записей
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for start in range(0, count, BATCH_RECORDS):
+            size = int(rng.choice(sizes))
+            keys, _ = generate_keys(min(BATCH_RECORDS, count - start), size, rng=rng)
+            plain = rng.integers(0, MODULE, size=(keys.shape[0], length // size, size))
+            close = np.einsum('rbj,rij->rbi', plain, keys) % MODULE
+            for i in range(keys.shape[0]):
+                f.write(json.dumps({'id': start + i, 'open': word_from_codes(plain[i].reshape(-1)),
+                                    'close': word_from_codes(close[i].reshape(-1)), 'size': size},
+                                   ensure_ascii=False) + '\n')
+    return count
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        dump, output = sys.argv[1], sys.argv[2]
+    else:
+        dump, output = 'lab-1/intercepts.jsonl', 'lab-1/recovered_keys.jsonl'
+        make_dump(dump, 200_000, seed=0)
+    stats = recover_dump(dump, output)
+    print(f"Записей: {stats['records']}, восстановлено: {stats['recovered']}, неудач: {stats['failed']}, "
+          f"{stats['records_per_sec']:.0f} записей/с")
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import sys
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+from hill import key_cache, prepare_key, start_coding_many, start_decoding_many
+from hill_recovery import recover_key
+
+
+# Локальный сервис шифра Хилла. Протокол - JSON по строке на запрос и на ответ, соединение держится,
+# сколько нужно клиенту. Ответы приходят по готовности, сопоставлять их с запросами нужно по id.
+#   {"id": 1, "op": "encrypt", "key": [[11, 27], [20, 23]], "text": "ПРОСТРАНСТВО"} -> {"id": 1, "text": "..."}
+#   {"id": 2, "op": "decrypt", "key": [[11, 27], [20, 23]], "text": "..."}
+#   {"id": 3, "op": "recover", "open": "...", "close": "...", "size": 2}     -> {"id": 3, "key": [[...]]}
+#   {"id": 4, "op": "stats"}
+# Хвост сообщения короче размера ключа отбрасывается, как в start_coding.
+HOST, PORT = '127.0.0.1', 8031
+BATCH_WINDOW = 0.002  # сколько секунд собираем запросы с одним ключом в одну пачку
+LATENCY_WINDOW = 10_000  # по скольким последним запросам считаются перцентили задержки
+LINE_LIMIT = 1 << 24  # самая длинная строка запроса или ответа в байтах; на более длинный запрос приходит ошибка
+
+
+async def read_lines(reader: asyncio.StreamReader):
+    """
+    Строки потока по одной. Строка длиннее лимита читателя пропускается до своего перевода строки,
+    вместо неё выдаётся None - соединение и остальные запросы в нём не страдают.
+    """
+    oversized = False
+    while True:
+        try:
+            line = await reader.readuntil(b'\n')
+        except asyncio.LimitOverrunError as e:  # выбрасываем начало длинной строки и ищем её конец дальше
+            await reader.readexactly(e.consumed)
+            oversized = True
+            continue
+        except asyncio.IncompleteReadError as e:  # конец потока: последняя строка без перевода строки
+            if oversized or e.partial:
+                yield None if oversized else e.partial
+            return
+        yield None if oversized else line
+        oversized = False
+
+
+def check_key(key) -> np.ndarray:  # ключ из запроса: непустая квадратная матрица, иначе ValueError
+    array = np.asarray(key)
+    if array.ndim != 2 or array.shape[0] != array.shape[1] or array.size == 0:
+        raise ValueError(f"Ключ должен быть квадратной матрицей, получено {array.shape}")
+    return array
+
+
+class HillService:
+    def __init__(self, batch_window: float = BATCH_WINDOW):
+        self.batch_window = batch_window
+        self._pending = {}  # (op, ключ) -> (ключ, [(текст, future), ...])
+        self._flush_scheduled = False
+        self.started = perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    async def cipher(self, op: str, key, text: str) -> str:
+        """
+        Ставит запрос в пачку своего ключа. Пачка уходит одним вызовом start_coding_many /
+        start_decoding_many через batch_window после первого запроса в ней.
+        """
+        if not isinstance(text, str):
+            raise TypeError(f"Текст должен быть строкой, получено {type(text).__name__}")
+        prepared = prepare_key(check_key(key))  # разбор, проверка и обратный ключ - из кэша ключей
+        group_key = (op, prepared.key.shape, prepared.key.tobytes())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(group_key, (prepared.key, []))[1].append((text, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        self._flush_scheduled = False
+        for (op, _, _), (key, items) in pending.items():
+            texts = [text for text, _ in items]
+            run = start_coding_many if op == 'encrypt' else start_decoding_many
+            self.batches += 1
+            self.batched_requests += len(items)
+            try:
+                try:
+                    results = run([key], texts)[0]
+                except Exception:  # в пачке плохое сообщение - считаем каждое отдельно, чтобы ошибка досталась только ему
+                    results = []
+                    for text in texts:
+                        try:
+                            results.append(run([key], [text])[0][0])
+                        except Exception as e:
+                            results.append(e)
+                for (_, future), result in zip(items, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            finally:  # callback call_later не должен оставить ни одного запроса без ответа
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Пачка запросов не обработана"))
+
+    async def execute(self, request: dict) -> dict:
+        if not isinstance(request, dict):
+            raise ValueError("Запрос должен быть JSON-объектом")
+        op = request.get('op')
+        if op in ('encrypt', 'decrypt'):
+            return {'text': await self.cipher(op, request['key'], request['text'])}
+        if op == 'recover':
+            size = int(request['size'])
+            if size < 1:
+                raise ValueError(f"Размер ключа должен быть положительным, получено {size}")
+            return {'key': recover_key(request['open'], request['close'], size).tolist()}
+        if op == 'stats':
+            return {'stats': self.stats()}
+        raise ValueError(f"Неизвестная операция: {op}")
+
+    def stats(self) -> dict:
+        uptime = perf_counter() - self.started
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'requests_per_sec': self.requests / uptime if uptime else 0.0,
+            'batches': self.batches,
+            'mean_batch': self.batched_requests / self.batches if self.batches else 0.0,
+            'latency_ms': {'mean': float(latencies.mean()), 'p50': float(np.percentile(latencies, 50)),
+                           'p99': float(np.percentile(latencies, 99)), 'max': float(latencies.max())},
+            'key_cache': key_cache.stats(),
+        }
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock):  # line = None - строка длиннее лимита
+        started = perf_counter()
+        response = {}
+        try:
+            if line is None:
+                raise ValueError(f"Строка запроса длиннее {LINE_LIMIT} байт")
+            request = json.loads(line)
+            if isinstance(request, dict):
+                response['id'] = request.get('id')
+            response.update(await self.execute(request))
+        except Exception as e:  # на любой запрос должен уйти ответ, иначе клиент ждёт вечно
+            self.errors += 1
+            response['error'] = f"{type(e).__name__}: {e}"
+        self.requests += 1
+        self.latencies.append(perf_counter() - started)
+        async with lock:
+            writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):  # одно соединение, запросов сколько угодно
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            async for line in read_lines(reader):
+                task = asyncio.create_task(self._answer(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:  # соединение закрывается только после ответов на все прочитанные запросы
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+
+async def serve(host: str = HOST, port: int = PORT, path: str = None, service: HillService = None) -> asyncio.AbstractServer:
+    """Запускает сервис на TCP host:port или, если задан path, на Unix-сокете."""
+    service = HillService() if service is None else service
+    if path is not None:
+        return await asyncio.start_unix_server(service.handle, path=path, limit=LINE_LIMIT)
+    return await asyncio.start_server(service.handle, host, port, limit=LINE_LIMIT)
+
+
+class HillClient:
+    """Клиент с одним постоянным соединением: запросы можно слать параллельно, ответы разбираются по id."""
+
+    def __init__(self, host: str = HOST, port: int = PORT, path: str = None):
+        self.host, self.port, self.path = host, port, path
+        self._next_id = 0
+        self._waiting = {}
+
+    async def __aenter__(self):
+        if self.path is not None:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.path, limit=LINE_LIMIT)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=LINE_LIMIT)
+        self._listener = asyncio.create_task(self._listen())
+        return self
+
+    async def __aexit__(self, *exc):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._listener.cancel()
+
+    async def _listen(self):
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            self._waiting.pop(response['id']).set_result(response)
+
+    async def request(self, op: str, **fields) -> dict:
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[self._next_id] = future
+        self.writer.write(json.dumps({'id': self._next_id, 'op': op, **fields}, ensure_ascii=False).encode('utf-8') + b'\n')
+        await self.writer.drain()
+        response = await future
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+
+async def main(address: str = None):
+    if address is not None and not address.isdigit():
+        server = await serve(path=address)
+    else:
+        server = await serve(port=int(address) if address else PORT)
+    print(f"Сервис шифра Хилла слушает {', '.join(str(s.getsockname()) for s in server.sockets)}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else None))
@@ -0,0 +1,133 @@
+from time import perf_counter
+from typing import Iterator
+
+import numpy as np
+
+from alphabet import alphabet_dict, codec
+from hill import MODULE, Hill_cipher_blocks, word_from_codes, to_array, prepare_key
+from report import per_second
+
+
+CHUNK_SIZE = 1 << 16  # сколько символов файла читаем за раз
+PADDINGS = ('pkcs', 'drop', 'none')
+
+
+def read_codes(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Читает UTF-8 файл кусками по chunk_size символов и отдаёт коды букв.
+    Буквы приводятся к верхнему регистру, символы вне алфавита (пробелы, знаки, Ъ, Ь) пропускаются.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            text = f.read(chunk_size)
+            if not text:
+                break
+            codes = codec.encode(text.upper(), skip_unknown=True)
+            if codes.size:
+                yield codes
+
+
+def iter_blocks(chunks: Iterator[np.ndarray], length: int, padding: str = 'pkcs') -> Iterator[np.ndarray]:
+    """
+    Собирает из потока кодов блоки (k, length), перенося остаток между кусками.
+
+    padding - что делать с хвостом короче length:
+        'pkcs' - дополнить до целого блока q буквами с кодом q (1 <= q <= length),
+                 при ровном делении добавляется целый блок, поэтому дополнение всегда снимается однозначно;
+        'drop' - отбросить хвост, как make_subvectors;
+        'none' - хвост недопустим, ValueError.
+    """
+    if padding not in PADDINGS:
+        raise ValueError(f"Неизвестный режим дополнения: {padding}")
+    if padding == 'pkcs' and length >= MODULE:
+        raise ValueError(f"Дополнение 'pkcs' требует длину блока меньше {MODULE}")
+
+    tail = np.empty(0, dtype=np.uint8)
+    for chunk in chunks:
+        codes = np.concatenate((tail, chunk))
+        count = codes.size // length
+        tail = codes[count * length:]
+        if count:
+            yield codes[:count * length].reshape(count, length)
+
+    if padding == 'pkcs':
+        q = length - tail.size
+        yield np.concatenate((tail, np.full(q, q, dtype=np.uint8))).reshape(1, length)
+    elif padding == 'none' and tail.size:
+        raise ValueError(f"Длина сообщения не кратна {length}, осталось {tail.size} букв")
+
+
+def strip_padding(blocks: Iterator[np.ndarray], length: int) -> Iterator[np.ndarray]:  # снимает 'pkcs' дополнение, придерживая последний кусок
+    pending = None
+    for block in blocks:
+        if pending is not None:
+            yield pending
+        pending = block
+    if pending is None:
+        raise ValueError("Пустое сообщение: нет блока с дополнением")
+
+    codes = pending.reshape(-1)
+    q = int(codes[-1])
+    if not 1 <= q <= length or np.any(codes[codes.size - q:] != q):
+        raise ValueError("Повреждённое дополнение: неверный ключ или сообщение")
+    yield codes[:codes.size - q]
+
+
+def hill_stream(key: np.ndarray, blocks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:  # шифр Хилла над потоком блоков
+    for block in blocks:
+        yield Hill_cipher_blocks(key, block)
+
+
+def write_codes(path: str, chunks: Iterator[np.ndarray]) -> int:  # пишет поток кодов в файл словом, возвращает число букв
+    letters = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(word_from_codes(chunk))
+            letters += chunk.size
+    return letters
+
+
+def _report(letters: int, seconds: float) -> dict:
+    return {
+        'letters': letters,
+        'seconds': seconds,
+        'letters_per_sec': per_second(letters, seconds),
+    }
+
+
+def encrypt_file(key, src: str, dst: str, chunk_size: int = CHUNK_SIZE, padding: str = 'pkcs') -> dict:
+    """
+    Потоковое шифрование файла src в dst. Память не зависит от размера файла.
+    Возвращает число записанных букв, время и пропускную способность (букв/с).
+    """
+    key = to_array(key)
+    start = perf_counter()
+    blocks = iter_blocks(read_codes(src, chunk_size), key.shape[1], padding)
+    letters = write_codes(dst, hill_stream(key, blocks))
+    return _report(letters, perf_counter() - start)
+
+
+def decrypt_file(key, src: str, dst: str, chunk_size: int = CHUNK_SIZE, padding: str = 'pkcs') -> dict:
+    """
+    Потоковое дешифрование файла src в dst.
+    Шифротекст должен делиться на блоки нацело; при padding='pkcs' дополнение снимается.
+    """
+    reversed_key = prepare_key(key).inverse
+    length = reversed_key.shape[1]
+    start = perf_counter()
+    blocks = iter_blocks(read_codes(src, chunk_size), length, 'drop' if padding == 'drop' else 'none')
+    open_blocks = hill_stream(reversed_key, blocks)
+    if padding == 'pkcs':
+        open_blocks = strip_padding(open_blocks, length)
+    letters = write_codes(dst, open_blocks)
+    return _report(letters, perf_counter() - start)
+
+
+if __name__ == '__main__':
+    K = [[alphabet_dict['К'], alphabet_dict['Ы']],
+         [alphabet_dict['У'], alphabet_dict['Ц']]]
+
+    stats = encrypt_file(K, 'lab-1/word.txt', 'lab-1/word.hill.txt')
+    print(f"Зашифровано {stats['letters']} букв, {stats['letters_per_sec']:.0f} букв/с")
+    stats = decrypt_file(K, 'lab-1/word.hill.txt', 'lab-1/word.open.txt')
+    print(f"Расшифровано {stats['letters']} букв, {stats['letters_per_sec']:.0f} букв/с")
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+# Проверка холодного старта библиотечных модулей: каждый импортируется в свежем интерпретаторе,
+# импорт не должен превышать бюджет и не должен тянуть sympy / pprint (они нужны только для show_annot).
+LAB_DIR = Path(__file__).resolve().parent
+MODULES = ('alphabet', 'modular', 'hill', 'hill_stream', 'hill_recovery')
+FORBIDDEN = ('sympy', 'pprint')
+BUDGET_MS = 250
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+print((time.perf_counter() - start) * 1000)
+print(' '.join(m for m in {forbidden!r} if m in sys.modules))
+'''
+
+
+def measure(module: str) -> tuple:  # (время импорта в мс, загруженные лишние модули)
+    result = subprocess.run([sys.executable, '-c', PROBE.format(module=module, forbidden=FORBIDDEN)],
+                            cwd=LAB_DIR, capture_output=True, text=True, check=True)
+    elapsed, loaded = (result.stdout.split('\n') + [''])[:2]
+    return float(elapsed), loaded.split()
+
+
+def check(budget_ms: float = BUDGET_MS) -> bool:
+    ok = True
+    for module in MODULES:
+        elapsed, loaded = measure(module)
+        passed = elapsed <= budget_ms and not loaded
+        ok &= passed
+        note = f", загружены {', '.join(loaded)}" if loaded else ''
+        print(f"{'OK  ' if passed else 'FAIL'} {module}: {elapsed:.0f} мс из {budget_ms:.0f}{note}")
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check(float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS) else 1)
@@ -0,0 +1,102 @@
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from hill import MODULE, PreparedKey, generate_keys, to_array
+from modular import det_mod, inv_mod, is_prime
+
+
+# Хранилище ключей одного размера n вместе с обратными ключами и определителями.
+# Файл: заголовок, затем упакованные массивы подряд:
+#   ids [count] uint64 (по возрастанию), keys [count, n, n] uint8, inverses [count, n, n] uint8, dets [count] uint8.
+# Файл отображается в память, поэтому загрузка не читает, не разбирает и не обращает ключи.
+MAGIC = 0x59454B48  # 'HKEY'
+VERSION = 1
+HEADER = np.dtype([('magic', '<u4'), ('version', '<u4'), ('count', '<u8'), ('size', '<u4'), ('mod', '<u4'),
+                   ('reserved', '<u8')])
+
+
+def write_store(path: str, keys, ids=None, mod: int = MODULE) -> int:
+    """
+    Записывает стопку ключей (count, n, n) с посчитанными обратными и определителями.
+    ids - номера ключей (по умолчанию 0..count-1); необратимый ключ или непростой модуль - ValueError.
+    возвращает: число записанных ключей
+    """
+    if mod >= 256 or not is_prime(mod):  # det_mod и inv_mod верны только над полем Z_p
+        raise ValueError(f"Хранилище работает с простыми модулями меньше 256 (элементы в uint8), получено {mod}")
+    keys = to_array(keys) % mod
+    count = keys.shape[0]
+    ids = np.arange(count, dtype=np.uint64) if ids is None else np.asarray(ids, dtype=np.uint64)
+    if ids.shape != (count,) or np.unique(ids).size != count:
+        raise ValueError("Номера ключей должны быть уникальны, по одному на ключ")
+
+    dets = det_mod(keys, mod)
+    if np.any(dets == 0):
+        raise ValueError(f"Ключи {ids[dets == 0][:5].tolist()} необратимы по модулю {mod}")
+    inverses = np.stack([inv_mod(key, mod) for key in keys]) if count else np.empty_like(keys)
+
+    order = np.argsort(ids)
+    header = np.array([(MAGIC, VERSION, count, keys.shape[-1], mod, 0)], dtype=HEADER)
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(ids[order].astype('<u8').tobytes())
+        for table in (keys[order], inverses[order], dets[order]):
+            f.write(table.astype(np.uint8).tobytes())
+    return count
+
+
+class KeyStore:
+    """
+    Хранилище ключей, отображённое в память. Поиск по номеру - двоичный поиск в ids.
+    keys / inverses / dets - массивы сразу на все ключи, для пакетной работы (например, Hill_cipher_keys).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if header.size == 0 or header['magic'][0] != MAGIC or header['version'][0] != VERSION:
+            raise ValueError(f"{path} не хранилище ключей версии {VERSION}")
+        count, n = int(header['count'][0]), int(header['size'][0])
+        self.mod = int(header['mod'][0])
+        self.size = n
+
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+        ids_end = HEADER.itemsize + 8 * count
+        self.ids = raw[HEADER.itemsize:ids_end].view('<u8')
+        tables = raw[ids_end:ids_end + count * (2 * n * n + 1)]
+        self.keys = tables[:count * n * n].reshape(count, n, n)
+        self.inverses = tables[count * n * n:2 * count * n * n].reshape(count, n, n)
+        self.dets = tables[2 * count * n * n:]
+
+    def __len__(self) -> int:
+        return self.ids.size
+
+    def index(self, key_id: int) -> int:  # позиция ключа в массивах, KeyError если такого номера нет
+        i = int(np.searchsorted(self.ids, key_id))
+        if i == self.ids.size or self.ids[i] != key_id:
+            raise KeyError(key_id)
+        return i
+
+    def __contains__(self, key_id: int) -> bool:
+        try:
+            self.index(key_id)
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key_id: int) -> PreparedKey:  # ключ с обратным, как из KeyCache, но без вычислений
+        i = self.index(key_id)
+        return PreparedKey(self.keys[i].astype(np.int64), self.inverses[i].astype(np.int64), int(self.dets[i]))
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else 'lab-1/keys.hks'
+    keys, _ = generate_keys(10_000, 3)
+    write_store(path, keys, ids=np.arange(keys.shape[0]) * 7)
+
+    start = perf_counter()
+    store = KeyStore(path)
+    prepared = store.get(7 * 1234)
+    print(f"Загружено {len(store)} ключей {store.size}x{store.size} за {(perf_counter() - start) * 1000:.2f} мс")
+    print(f"Ключ 8638:\n{prepared.key}\nОбратный:\n{prepared.inverse}\ndet = {prepared.det}")
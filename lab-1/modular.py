@@ -0,0 +1,223 @@
+import numpy as np
+
+
+# Линейная алгебра над полем Z_p (p - простое) на целочисленных массивах NumPy.
+# Все промежуточные произведения < p^2, поэтому int64 не переполняется при p < 3 * 10^9.
+# Исключение - матричные произведения: сумма n слагаемых до p^2 переполнится, их считает matmul_mod.
+FLOAT_EXACT = 2 ** 53  # до этой границы float64 представляет целые точно
+LIMB_BITS = 16
+
+
+def is_prime(p: int) -> bool:  # все функции модуля, кроме matmul_mod, верны только для простого p
+    return p >= 2 and all(p % d for d in range(2, int(p ** 0.5) + 1))
+
+
+def inv_mod_array(x: np.ndarray, p: int) -> np.ndarray:
+    """
+    Обратные по модулю простого p элементы массива (малая теорема Ферма: x^(p-2)).
+    Для нулей возвращает 0.
+    """
+    x = np.asarray(x, dtype=np.int64) % p
+    zero = x == 0
+    result = np.ones_like(x)
+    power = p - 2
+    while power:
+        if power & 1:
+            result = result * x % p
+        x = x * x % p
+        power >>= 1
+    return np.where(zero, 0, result)  # при p = 2 степень p - 2 нулевая и без этого нуль перешёл бы в 1
+
+
+def _matmul_blocked(a: np.ndarray, b: np.ndarray, p: int, bound: int) -> np.ndarray:
+    """
+    a @ b по модулю p в float64 (BLAS): общая размерность режется на куски по kb,
+    чтобы сумма kb произведений, каждое не больше bound, оставалась точной (< 2^53).
+    После каждого куска - взятие по модулю и накопление в int64.
+    """
+    kb = max((FLOAT_EXACT - 1) // max(bound, 1), 1)
+    a, b = a.astype(np.float64), b.astype(np.float64)
+    k = a.shape[-1]
+    if k <= kb:
+        return (a @ b).astype(np.int64) % p
+    result = np.zeros(a.shape[:-1] + b.shape[-1:], dtype=np.int64)
+    for start in range(0, k, kb):
+        part = (a[..., start:start + kb] @ b[start:start + kb]).astype(np.int64)
+        part %= p
+        result += part  # кусков не больше k, поэтому сумма < k * p - без переполнения
+    return result % p
+
+
+def matmul_mod(a, b, p: int) -> np.ndarray:
+    """
+    Матричное произведение a @ b по модулю p без переполнения при любых размерах (p < 2^31).
+    Пока (p - 1)^2 < 2^53 - одно или несколько умножений float64 через BLAS;
+    для больших модулей a раскладывается на 16-битные половины: a = a_hi * 2^16 + a_lo.
+    """
+    if p >= 2 ** 31:
+        raise ValueError("Модуль должен быть меньше 2^31")
+    a = np.asarray(a, dtype=np.int64) % p
+    b = np.asarray(b, dtype=np.int64) % p
+    if (p - 1) ** 2 < FLOAT_EXACT:
+        return _matmul_blocked(a, b, p, (p - 1) ** 2)
+    low_mask = (1 << LIMB_BITS) - 1
+    high = _matmul_blocked(a >> LIMB_BITS, b, p, ((p - 1) >> LIMB_BITS) * (p - 1))
+    low = _matmul_blocked(a & low_mask, b, p, low_mask * (p - 1))
+    return (high * ((1 << LIMB_BITS) % p) + low) % p
+
+
+def det_mod(a, p: int) -> np.ndarray:
+    """
+    Определитель по модулю простого p методом Гаусса.
+    Работает сразу для стопки матриц: a формы (..., n, n) -> определители формы (...).
+    """
+    a = np.array(a, dtype=np.int64) % p
+    batch_shape, n = a.shape[:-2], a.shape[-1]
+    a = a.reshape(-1, n, n)
+    idx = np.arange(a.shape[0])
+    det = np.ones(a.shape[0], dtype=np.int64)
+
+    for col in range(n):
+        nonzero = a[:, col:, col] != 0
+        piv = col + np.argmax(nonzero, axis=1)  # первая ненулевая строка в столбце, у вырожденных - col
+        det[~nonzero.any(axis=1)] = 0
+
+        swapped = piv != col
+        rows = a[idx, col].copy()
+        a[idx, col] = a[idx, piv]
+        a[idx, piv] = rows
+        det[swapped] = (p - det[swapped]) % p
+
+        pivots = a[:, col, col]
+        det = det * pivots % p
+        factors = a[:, col + 1:, col] * inv_mod_array(pivots, p)[:, None] % p
+        a[:, col + 1:] = (a[:, col + 1:] - factors[:, :, None] * a[:, col, None, :]) % p
+
+    return det.reshape(batch_shape)
+
+
+def row_reduce(a, p: int) -> tuple:
+    """
+    Приведение к ступенчатому виду Гаусса-Жордана по модулю простого p.
+    На каждом шаге весь столбец обнуляется одной векторной операцией над строками.
+
+    a: (m, k) матрица
+    возвращает: (приведённая матрица, список столбцов с ведущими элементами)
+    """
+    a = np.array(a, dtype=np.int64) % p
+    m, k = a.shape
+    pivot_cols = []
+    row = 0
+    for col in range(k):
+        if row == m:
+            break
+        nonzero = np.flatnonzero(a[row:, col])
+        if nonzero.size == 0:
+            continue
+        piv = row + nonzero[0]
+        if piv != row:
+            a[[row, piv]] = a[[piv, row]]
+        a[row] = a[row] * inv_mod_array(a[row, col], p) % p
+
+        factors = a[:, col].copy()
+        factors[row] = 0
+        a -= factors[:, None] * a[row]
+        a %= p
+        pivot_cols.append(col)
+        row += 1
+    return a, pivot_cols
+
+
+def rank_mod(a, p: int) -> int:  # ранг матрицы над Z_p
+    return len(row_reduce(a, p)[1])
+
+
+def inv_mod(a, p: int) -> np.ndarray:
+    """
+    Обратная матрица по модулю простого p: [A | E] -> [E | A^-1].
+    Для вырожденной матрицы ValueError.
+    """
+    a = np.asarray(a, dtype=np.int64)
+    n = a.shape[0]
+    if a.shape != (n, n):
+        raise ValueError(f"Обратная матрица есть только у квадратной, получено {a.shape}")
+    reduced, pivot_cols = row_reduce(np.hstack((a, np.eye(n, dtype=np.int64))), p)
+    if pivot_cols[:n] != list(range(n)):
+        raise ValueError(f"Матрица вырождена по модулю {p}")
+    return reduced[:, n:]
+
+
+def solve_mod(a, b, p: int) -> np.ndarray:
+    """
+    Решение системы A x = b по модулю простого p.
+    b - вектор или матрица правых частей. Если решений много, возвращается одно
+    (свободные переменные равны нулю); если решений нет - ValueError.
+    """
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    vector = b.ndim == 1
+    rhs = b.reshape(b.shape[0], -1)
+    k = a.shape[1]
+
+    reduced, pivot_cols = row_reduce(np.hstack((a, rhs)), p)
+    if pivot_cols and pivot_cols[-1] >= k:
+        raise ValueError(f"Система несовместна по модулю {p}")
+
+    x = np.zeros((k, rhs.shape[1]), dtype=np.int64)
+    x[pivot_cols] = reduced[:len(pivot_cols), k:]
+    return x.reshape(-1) if vector else x
+
+
+def solve_mod_batch(a, b, p: int) -> tuple:
+    """
+    Пачка систем A_i X_i = B_i по модулю простого p, у которых ждём единственное решение.
+    Гаусс-Жордан идёт сразу по всем системам, как det_mod; строк m может быть больше n,
+    лишние уравнения служат проверкой.
+
+    a: (R, m, n), b: (R, m, k)
+    возвращает: (X формы (R, n, k), ранг A_i полный, система совместна) - маски формы (R,);
+                X_i имеет смысл только там, где обе маски истинны
+    """
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    n = a.shape[-1]
+    m = np.concatenate((a, b), axis=-1) % p
+    if m.shape[1] < n:  # уравнений меньше неизвестных - дополняем нулевыми, ранг всё равно неполный
+        m = np.concatenate((m, np.zeros((m.shape[0], n - m.shape[1], m.shape[2]), dtype=np.int64)), axis=1)
+    idx = np.arange(m.shape[0])
+    full_rank = np.ones(m.shape[0], dtype=bool)
+
+    for col in range(n):
+        nonzero = m[:, col:, col] != 0
+        full_rank &= nonzero.any(axis=1)
+        piv = col + np.argmax(nonzero, axis=1)
+        rows = m[idx, col].copy()
+        m[idx, col] = m[idx, piv]
+        m[idx, piv] = rows
+
+        m[:, col] = m[:, col] * inv_mod_array(m[:, col, col], p)[:, None] % p
+        factors = m[:, :, col].copy()
+        factors[:, col] = 0
+        m -= factors[:, :, None] * m[:, col, None, :]
+        m %= p
+
+    consistent = ~np.any(m[:, n:, n:] != 0, axis=(1, 2))
+    return m[:, :n, n:], full_rank, consistent
+
+
+def inv_mod_power(a, p: int, k: int) -> np.ndarray:
+    """
+    Обратная матрица по модулю p^k (p - простое), например по модулю 256 = 2^8.
+    Z_{p^k} не поле, поэтому обратная ищется по модулю p и уточняется итерациями Ньютона
+    X <- X (2E - A X): каждая итерация удваивает число верных p-ичных разрядов.
+    Матрица обратима по модулю p^k тогда и только тогда, когда обратима по модулю p.
+    """
+    a = np.asarray(a, dtype=np.int64)
+    n = a.shape[0]
+    x = inv_mod(a, p)
+    two = 2 * np.eye(n, dtype=np.int64)
+    precision, target = p, p ** k
+    while precision < target:
+        precision = min(precision ** 2, target)
+        x = x @ ((two - a @ x) % precision) % precision
+    return x
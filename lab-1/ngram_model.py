@@ -0,0 +1,109 @@
+import sys
+
+import numpy as np
+
+from alphabet import alphabet_dict
+from hill_stream import read_codes, CHUNK_SIZE
+
+
+# Формат файла модели: заголовок MAGIC + версия + размер алфавита (3 x uint32),
+# затем float32 таблицы подряд: log P(a) [m], log P(b | a) [m, m], log P(c | a b) [m, m, m].
+MAGIC = 0x52474E48  # 'HNGR'
+VERSION = 1
+HEADER = np.dtype([('magic', '<u4'), ('version', '<u4'), ('alphabet', '<u4')])
+SMOOTHING = 0.5  # добавка к каждому счётчику, чтобы не встречавшиеся n-граммы не давали -inf
+
+
+def count_ngrams(path: str, size: int = len(alphabet_dict), chunk_size: int = CHUNK_SIZE) -> tuple:
+    """
+    Счётчики 1-, 2- и 3-грамм корпуса. Файл читается кусками, две последние буквы куска
+    переносятся в следующий, чтобы не терять n-граммы на стыке.
+    """
+    uni = np.zeros(size, dtype=np.int64)
+    bi = np.zeros(size ** 2, dtype=np.int64)
+    tri = np.zeros(size ** 3, dtype=np.int64)
+    tail = np.empty(0, dtype=np.int64)
+    for chunk in read_codes(path, chunk_size):
+        uni += np.bincount(chunk, minlength=size)
+        codes = np.concatenate((tail, chunk.astype(np.int64)))
+        pairs = codes[max(0, tail.size - 1):]  # биграмма из двух букв переноса уже посчитана в прошлом куске
+        bi += np.bincount(pairs[:-1] * size + pairs[1:], minlength=size ** 2)
+        tri += np.bincount((codes[:-2] * size + codes[1:-1]) * size + codes[2:], minlength=size ** 3)
+        tail = codes[-2:]
+    return uni, bi.reshape(size, size), tri.reshape(size, size, size)
+
+
+def conditional_log_probs(counts: np.ndarray) -> np.ndarray:  # log P(последняя буква | предыдущие) со сглаживанием
+    counts = counts + SMOOTHING
+    return np.log(counts / counts.sum(axis=-1, keepdims=True)).astype(np.float32)
+
+
+def build_model(corpus_path: str, model_path: str, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Строит модель по корпусу и сохраняет её в компактный двоичный файл (около 120 КБ для 31 буквы).
+    возвращает: число букв корпуса и размер алфавита
+    """
+    size = len(alphabet_dict)
+    uni, bi, tri = count_ngrams(corpus_path, size, chunk_size)
+    header = np.array([(MAGIC, VERSION, size)], dtype=HEADER)
+    with open(model_path, 'wb') as f:
+        f.write(header.tobytes())
+        for table in (conditional_log_probs(uni), conditional_log_probs(bi), conditional_log_probs(tri)):
+            f.write(table.tobytes())
+    return {'letters': int(uni.sum()), 'alphabet': size}
+
+
+class NgramModel:
+    """
+    Модель, отображённая в память: таблицы не читаются и не пересчитываются при загрузке.
+    Экземпляр можно передавать как score в brute_force / row_attack: он вызывается на (k, B, n)
+    расшифровках и возвращает (k,) сумму логарифмов вероятностей по n-граммам.
+
+    order: 1 - только частоты букв, 2 - биграммы, 3 - триграммы
+    """
+
+    def __init__(self, path: str, order: int = 3):
+        if order not in (1, 2, 3):
+            raise ValueError(f"Порядок модели должен быть 1, 2 или 3, получено {order}")
+        self.path = path
+        self.order = order
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if header.size == 0 or header['magic'][0] != MAGIC or header['version'][0] != VERSION:
+            raise ValueError(f"{path} не файл n-граммной модели версии {VERSION}")
+        m = self.size = int(header['alphabet'][0])
+
+        tables = np.memmap(path, dtype='<f4', mode='r', offset=HEADER.itemsize, shape=(m + m ** 2 + m ** 3,))
+        self.uni = tables[:m]
+        self.bi = tables[m:m + m ** 2]  # плоские таблицы: индекс биграммы a * m + b
+        self.tri = tables[m + m ** 2:]
+
+    def __reduce__(self):  # в процессы пула передаётся только путь, таблицы там отображаются заново
+        return NgramModel, (self.path, self.order)
+
+    def score(self, texts: np.ndarray) -> np.ndarray:
+        """
+        texts: (k, L) или (k, B, n) коды букв k кандидатов
+        возвращает: (k,) log P(текст) по цепи Маркова порядка order - 1
+        """
+        x = np.asarray(texts).reshape(len(texts), -1).astype(np.intp)
+        m = self.size
+        if x.shape[1] == 0:  # пустой текст: вероятность 1
+            return np.zeros(x.shape[0])
+        scores = self.uni[x[:, 0]].astype(np.float64)
+        if self.order == 1 or x.shape[1] == 1:  # в тексте из одной буквы пар нет, остаётся униграмма
+            return scores + self.uni[x[:, 1:]].sum(axis=1)
+
+        pairs = x[:, :-1] * m + x[:, 1:]
+        scores += self.bi[pairs[:, 0]]
+        if self.order == 2:
+            return scores + self.bi[pairs[:, 1:]].sum(axis=1)
+        return scores + self.tri[pairs[:, :-1] * m + x[:, 2:]].sum(axis=1)
+
+    __call__ = score
+
+
+if __name__ == '__main__':
+    corpus = sys.argv[1] if len(sys.argv) > 1 else 'lab-1/word.txt'
+    model = sys.argv[2] if len(sys.argv) > 2 else 'lab-1/russian.ngram'
+    stats = build_model(corpus, model)
+    print(f"Модель {model}: {stats['letters']} букв корпуса, алфавит из {stats['alphabet']} букв")
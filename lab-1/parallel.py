@@ -0,0 +1,29 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+
+# Раздача задач пулу процессов для перебора ключей, Монте-Карло и восстановления дампов.
+# Задачи берутся из итератора лениво, в работе держится не больше IN_FLIGHT задач на процесс,
+# так что память не зависит от их общего числа.
+IN_FLIGHT = 2
+
+
+def pool_map(func: Callable, tasks: Iterable, workers: int = None) -> Iterator:
+    """
+    Результаты func для каждой задачи tasks в порядке задач, как map.
+    workers: число процессов, None - по числу ядер, 1 - без пула, в текущем процессе
+    """
+    workers = os.cpu_count() if workers is None else workers
+    if workers == 1:
+        yield from map(func, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = deque()
+        for task in tasks:
+            running.append(pool.submit(func, task))
+            if len(running) >= IN_FLIGHT * workers:
+                yield running.popleft().result()
+        while running:
+            yield running.popleft().result()
@@ -0,0 +1,74 @@
+import os
+import sys
+
+
+# Вывод пояснений по уровням подробности. Текст строится, только если его уровень включён:
+# вместо готовой строки или коллекции можно передать функцию без аргументов, тогда при
+# выключенном уровне вызов стоит одно сравнение. sympy грузится только для pretty-вывода.
+#   SILENT  - ничего не выводить (для длинных сообщений и замеров)
+#   SUMMARY - итоги: сообщения, найденные ошибки
+#   DETAIL  - всё, включая векторы и матрицы; большие наборы сокращаются до начала и конца
+SILENT, SUMMARY, DETAIL = 0, 1, 2
+HIDDEN = sys.maxsize  # уровень, который не включается никогда
+MAX_ITEMS = 8  # сколько векторов набора выводить целиком
+
+level = int(os.environ.get('HILL_REPORT', DETAIL))
+
+
+def set_level(new_level: int) -> int:  # возвращает прежний уровень, чтобы его можно было вернуть
+    global level
+    previous, level = level, new_level
+    return previous
+
+
+def enabled(at: int) -> bool:  # для циклов: проверить уровень один раз и не готовить данные для вывода
+    return at <= level
+
+
+def annotation(show_annot: bool, at: int = DETAIL) -> int:
+    """Уровень для пояснений функций с флагом show_annot: без флага они не выводятся, с флагом - на уровне at."""
+    return at if show_annot else HIDDEN
+
+
+def per_second(count: float, seconds: float) -> float:  # скорость для статистики замеров; за нулевое время - бесконечность
+    return count / seconds if seconds else float('inf')
+
+
+def say(at: int, message, *args):
+    """Печатает message (строку или результат функции без аргументов) и args, как print, если уровень at включён."""
+    if at > level:
+        return
+    print(message() if callable(message) else message, *args)
+
+
+def pretty(title, value, limit: int = MAX_ITEMS) -> str:
+    """
+    Текст pretty-вывода sympy: список или кортеж блоков - как векторы-столбцы, иначе - как матрица.
+    В наборе больше limit векторов показываются первые и последние limit // 2 с числом пропущенных.
+    """
+    from sympy import Matrix, pretty as sympy_pretty
+    lines = [] if title is None else [f'\n{title}:\n']
+    if not isinstance(value, (list, tuple)):
+        lines.append(sympy_pretty(Matrix(value)))
+        return '\n'.join(lines)
+
+    def vectors(part):  # в Matrix переводятся только выводимые векторы; кортеж остаётся кортежем - в круглых скобках
+        return type(value)(Matrix(v) for v in part)
+
+    if len(value) <= limit:
+        lines.append(sympy_pretty(vectors(value)))
+        return '\n'.join(lines)
+    half = max(limit // 2, 1)
+    head, tail = vectors(value[:half]), vectors(value[-half:])
+    lines.append(f'Всего {len(value)} векторов высоты {head[0].shape[0]}, первые и последние {half}:\n')
+    lines.append(sympy_pretty(head))
+    lines.append(f'... пропущено {len(value) - 2 * half} ...')
+    lines.append(sympy_pretty(tail))
+    return '\n'.join(lines)
+
+
+def show(at: int, title, value, limit: int = MAX_ITEMS):
+    """pretty-вывод value с заголовком title на уровне at; value может быть функцией без аргументов."""
+    if at > level:
+        return
+    print(pretty(title, value() if callable(value) else value, limit))
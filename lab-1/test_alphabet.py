@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from alphabet import AlphabetCodec, alphabet_dict, codec, reversed_alph_dict
+
+
+def test_codec_matches_dict():
+    word = ''.join(alphabet_dict)
+    assert codec.encode(word).tolist() == [alphabet_dict[s] for s in word]
+    assert codec.decode(np.arange(len(alphabet_dict))) == ''.join(reversed_alph_dict[i] for i in range(len(alphabet_dict)))
+    assert codec.decode(codec.encode('ПРОСТРАНСТВО').reshape(3, 4)) == 'ПРОСТРАНСТВО'
+    assert codec.encode('').size == 0 and codec.decode([]) == ''
+
+
+def test_codec_unknown_symbols():
+    with pytest.raises(KeyError, match='Ь'):
+        codec.encode('ПЬЕСА')
+    with pytest.raises(KeyError):
+        codec.encode('A\U0001F600')  # латиница и символы за пределами таблицы
+    assert codec.decode(codec.encode('Пь еса! ЁЖ\U0001F600'.upper(), skip_unknown=True)) == 'ПЕСАЁЖ'
+    for codes in ([31], [-1]):
+        with pytest.raises(KeyError):
+            codec.decode(codes)
+
+
+def test_codec_rejects_large_alphabet():
+    with pytest.raises(ValueError):
+        AlphabetCodec({chr(0x4E00 + i): i for i in range(300)})
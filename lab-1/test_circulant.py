@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from circulant import NTT, CirculantKey
+from hill import MODULE, Hill_cipher_blocks, codes_from_word
+
+
+P = MODULE
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(31)
+
+
+def test_circulant_matches_dense_key(rng):
+    key = CirculantKey.random(6, rng=rng)
+    blocks = rng.integers(0, P, size=(100, 6))
+    dense = key.to_matrix()
+    assert np.array_equal(key.encrypt_blocks(blocks), Hill_cipher_blocks(dense, blocks) % P)
+    assert np.array_equal(key.decrypt_blocks(key.encrypt_blocks(blocks)), blocks)
+    assert np.array_equal(dense @ key.to_matrix(key.inverse_column()) % P, np.eye(6, dtype=np.int64))
+
+
+def test_circulant_text_round_trip(rng):
+    key = CirculantKey.random(10, rng=rng)
+    word = 'ПРОСТРАНСТВОИВРЕМЯВМ'
+    assert key.start_decoding(codes_from_word(key.start_coding(codes_from_word(word)))) == word
+
+
+def test_circulant_power_of_two_over_257(rng):
+    key = CirculantKey.random(64, p=257, rng=rng)
+    blocks = rng.integers(0, 257, size=(10, 64))
+    assert np.array_equal(key.encrypt_blocks(blocks), blocks @ key.to_matrix().T % 257)
+
+
+def test_circulant_singular_and_unsupported_lengths():
+    with pytest.raises(ValueError):
+        CirculantKey([1, 1], P)  # спектр (2, 0)
+    with pytest.raises(ValueError):
+        CirculantKey.random(4)  # 4 не делит 30: ошибка сразу, без бесконечного подбора
+
+
+def test_ntt_round_trip(rng):
+    for n, p in ((6, 31), (15, 31), (8, 257), (1024, 65537)):
+        ntt = NTT(n, p)
+        a = rng.integers(0, p, size=(3, n))
+        assert np.array_equal(ntt.inverse(ntt.forward(a)), a)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+import hamming
+from hamming import (C, CODEWORD_FIX, DATA, ERROR_POSITION, H, HAMMING_ALL_BITS, R, SYNDROMES, bits_to_ints, decode,
+                     encode, ints_to_bits, nibbles_from_word, syndromes, word_from_nibbles)
+
+
+def test_tables_match_matrices():
+    words = ints_to_bits(np.arange(2 ** HAMMING_ALL_BITS), HAMMING_ALL_BITS).astype(np.int64)
+    columns = words @ H.T.astype(np.int64) % 2  # H u для всех 128 слов, бит k синдрома - строка k матрицы H
+    assert np.array_equal(SYNDROMES, columns @ (1 << np.arange(H.shape[0])))
+    assert np.array_equal(DATA, bits_to_ints(words @ R.T.astype(np.int64) % 2))
+    assert np.array_equal(hamming.CODEWORDS, bits_to_ints(ints_to_bits(np.arange(16), 4).astype(np.int64) @ C % 2))
+    assert np.all(SYNDROMES[hamming.CODEWORDS] == 0)
+    assert np.all(SYNDROMES[CODEWORD_FIX] == 0)
+
+
+def test_every_single_error_is_corrected():
+    nibbles = np.arange(16, dtype=np.uint8)
+    codewords = encode(nibbles)
+    for j in range(HAMMING_ALL_BITS):
+        damaged = codewords ^ np.uint8(1 << (HAMMING_ALL_BITS - 1 - j))  # бит j, считая со старшего
+        assert np.all(ERROR_POSITION[syndromes(damaged)] == j)
+        assert np.array_equal(decode(damaged), nibbles)
+    assert np.array_equal(decode(codewords), nibbles)
+
+
+def test_word_round_trip():
+    nibbles = nibbles_from_word('КРЫМ')
+    assert nibbles.size == 5 and word_from_nibbles(decode(encode(nibbles))) == 'КРЫМ'
+    with pytest.raises(ValueError):
+        nibbles_from_word('КРЫ')  # 15 бит не делятся на полубайты
+    with pytest.raises(KeyError):
+        nibbles_from_word('КРЁМ')
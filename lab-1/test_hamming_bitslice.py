@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from hamming import HAMMING_ALL_BITS
+from hamming_bitslice import (GROUP_BYTES, benchmark, decode_bytes, encode_bytes, errors_found, flip_one_bit_per_word,
+                              table_decode, table_encode)
+
+
+@pytest.mark.parametrize('size', [0, 1, GROUP_BYTES - 1, GROUP_BYTES, 1000])
+def test_bitslice_round_trip(size):
+    rng = np.random.default_rng(size)
+    payload = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    encoded = encode_bytes(payload)
+    assert len(encoded) == (size // GROUP_BYTES + 1) * HAMMING_ALL_BITS * 8
+    assert errors_found(encoded) == 0 and decode_bytes(encoded) == payload
+    damaged = flip_one_bit_per_word(encoded, rng)
+    assert errors_found(damaged) == len(encoded) // HAMMING_ALL_BITS * 8  # по 64 слова в каждом uint64
+    assert decode_bytes(damaged) == payload
+
+
+def test_bitslice_matches_table_engine():
+    rng = np.random.default_rng(24)
+    payload = rng.integers(0, 256, size=777, dtype=np.uint8).tobytes()
+    codewords = table_encode(payload)
+    assert codewords.size == 2 * len(payload) and table_decode(codewords) == payload
+    damaged = codewords ^ (1 << rng.integers(0, HAMMING_ALL_BITS, size=codewords.size)).astype(np.uint8)
+    assert table_decode(damaged) == decode_bytes(flip_one_bit_per_word(encode_bytes(payload), rng)) == payload
+
+
+def test_bitslice_rejects_bad_streams():
+    with pytest.raises(ValueError):
+        decode_bytes(b'\0' * (HAMMING_ALL_BITS * 8 - 1))  # не целое число групп
+    with pytest.raises(ValueError):
+        decode_bytes(b'\0' * HAMMING_ALL_BITS * 8)  # нулевое дополнение
+    with pytest.raises(ValueError):
+        decode_bytes(b'')
+
+
+def test_benchmark_reports_both_engines():
+    result = benchmark(1 << 12, seed=1)
+    assert result['bytes'] == 1 << 12
+    assert result['bitslice']['encoded_bytes'] == len(encode_bytes(bytes(1 << 12)))
+    assert result['table']['encoded_bytes'] == 2 << 12
+    assert all(r['encode_bytes_per_sec'] > 0 and r['decode_bytes_per_sec'] > 0
+               for r in (result['bitslice'], result['table']))
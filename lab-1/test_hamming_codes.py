@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+import hamming
+from hamming_codes import CORRECTED, DOUBLE_ERROR, OK, HammingCode, flip_bits
+
+
+CODES = [(r, extended) for r in (2, 3, 4, 6) for extended in (False, True)]
+
+
+def test_r3_matches_lab_matrices():
+    code = HammingCode(3)
+    assert np.array_equal(code.generator, hamming.C)
+    assert np.array_equal(code.parity_check, hamming.H)
+    assert np.array_equal(code.decoder, hamming.R)
+    assert (code.n, code.k, code.rate) == (7, 4, 4 / 7)
+
+
+@pytest.mark.parametrize('r, extended', CODES)
+def test_matrices_agree_with_fast_path(r, extended):
+    code = HammingCode(r, extended)
+    data = np.random.default_rng(r).integers(0, 2, size=(50, code.k), dtype=np.uint8)
+    codewords = code.encode(data)
+    assert np.array_equal(codewords, data.astype(np.int64) @ code.generator % 2)
+    assert not np.any(code.parity_check.astype(np.int64) @ codewords.T % 2)
+    assert np.array_equal(code.decoder.astype(np.int64) @ codewords.T % 2, data.T)
+    assert np.all(code.check(codewords) == OK) and np.array_equal(code.decode(codewords), data)
+
+
+@pytest.mark.parametrize('r, extended', CODES)
+def test_single_errors_corrected(r, extended):
+    code = HammingCode(r, extended)
+    rng = np.random.default_rng(r)
+    data = rng.integers(0, 2, size=(200, code.k), dtype=np.uint8)
+    damaged = flip_bits(code.encode(data), 1, rng)
+    assert np.all(code.check(damaged) == CORRECTED)
+    assert np.array_equal(code.decode(damaged), data)
+
+
+@pytest.mark.parametrize('r', [3, 4, 6])
+def test_secded_detects_double_errors(r):
+    code = HammingCode(r, extended=True)
+    rng = np.random.default_rng(r)
+    codewords = code.encode(rng.integers(0, 2, size=(200, code.k), dtype=np.uint8))
+    damaged = flip_bits(codewords, 2, rng)
+    assert np.all(code.check(damaged) == DOUBLE_ERROR)
+    assert np.array_equal(code.correct(damaged), damaged)  # такие слова не трогаем
+
+
+@pytest.mark.parametrize('r, extended', CODES)
+def test_bytes_round_trip(r, extended):
+    code = HammingCode(r, extended)
+    for payload in (b'', b'x', bytes(range(256)) * 3):
+        assert code.decode_bytes(code.encode_bytes(payload)) == payload
+
+
+def test_code_checks():
+    with pytest.raises(ValueError):
+        HammingCode(1)
+    with pytest.raises(ValueError):
+        HammingCode(3).decode_bytes(b'\xff' * 32)  # длина в заголовке больше данных
+    assert repr(HammingCode(4, extended=True)) == 'HammingCode(16, 11, SECDED)'
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from sympy import Matrix
+
+from alphabet import alphabet_dict, reversed_alph_dict
+from hill import (MODULE, Hill_cipher_blocks, Hill_cipher_keys, KeyCache, codes_from_word, generate_keys, make_blocks,
+                  start_coding, start_coding_many, start_decoding, start_decoding_many)
+from modular import det_mod
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(5)
+
+
+# --- движок на NumPy против sympy ---
+
+def sympy_coding(key, word: str) -> str:  # как было в 1_Hill_Cipher.py: блок за блоком через Matrix
+    n, result = len(key), ''
+    for start in range(0, len(word) - n + 1, n):
+        v = Matrix([alphabet_dict[s] for s in word[start:start + n]])
+        result += ''.join(reversed_alph_dict[int(x) % MODULE] for x in Matrix(key) * v)
+    return result
+
+
+@pytest.mark.parametrize('n', [2, 3, 4, 7])
+def test_blocks_match_sympy(rng, n):
+    key = rng.integers(0, MODULE, size=(n, n))
+    blocks = rng.integers(0, MODULE, size=(20, n))
+    expected = [list((Matrix(key.tolist()) * Matrix(v.tolist())).applyfunc(lambda x: x % MODULE)) for v in blocks]
+    assert Hill_cipher_blocks(key, blocks).tolist() == expected
+
+
+def test_start_coding_matches_sympy_and_round_trips(rng):
+    word = 'ПРОСТРАНСТВОИВРЕМЯ'
+    for n in (2, 3, 4):
+        key = generate_keys(1, n, rng=rng)[0][0]
+        close = start_coding(key, codes_from_word(word))
+        assert close == sympy_coding(key.tolist(), word)
+        assert start_decoding(key, codes_from_word(close)) == word[:len(word) // n * n]
+    assert make_blocks(codes_from_word(word), 4).shape == (4, 4)
+
+
+# --- генерация ключей ---
+
+def test_generate_keys_invertible(rng):
+    for n in (1, 2, 3, 6):
+        keys, rate = generate_keys(500, n, rng=rng)
+        assert keys.shape == (500, n, n) and keys.dtype == np.int64
+        assert np.all(det_mod(keys, MODULE) != 0) and np.all((0 <= keys) & (keys < MODULE))
+        assert 0.9 < rate <= 1  # доля обратимых матриц над Z_31 - около 1 - 1/31
+
+
+def test_generate_keys_empty_batch(rng):
+    for count in (0, -3):
+        keys, rate = generate_keys(count, 3, rng=rng)
+        assert keys.shape == (0, 3, 3) and np.isnan(rate)
+
+
+# --- кэш обратных ключей ---
+
+def test_key_cache_counts_and_evicts(rng):
+    keys, _ = generate_keys(3, 2, rng=rng)
+    cache = KeyCache(maxsize=2)
+    first = cache.get(keys[0])
+    assert np.array_equal(keys[0] @ first.inverse % MODULE, np.eye(2, dtype=np.int64))
+    assert cache.get(keys[0].tolist()) is first  # ключ узнаётся по содержимому, а не по объекту
+    cache.get(keys[1])
+    cache.get(keys[0])  # keys[0] снова самый свежий
+    cache.get(keys[2])  # вытесняет keys[1]
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 2, 'misses': 3, 'evictions': 1}
+    cache.get(keys[1])
+    assert cache.stats()['misses'] == 4
+    with pytest.raises(ValueError):
+        first.inverse[0, 0] = 1  # из кэша отдаются неизменяемые массивы
+    cache.clear()
+    assert cache.stats() == {'size': 0, 'maxsize': 2, 'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def test_key_cache_rejects_singular_key():
+    cache = KeyCache()
+    with pytest.raises(ValueError):
+        cache.get([[1, 2], [2, 4]])
+    assert cache.stats()['size'] == 0
+    with pytest.raises(ValueError):
+        KeyCache(maxsize=0)
+
+
+# --- пачки ключей и сообщений ---
+
+def test_cipher_keys_match_single_key(rng):
+    for n in (2, 5, 16):
+        keys, _ = generate_keys(4, n, rng=rng)
+        blocks = rng.integers(0, MODULE, size=(50, n))
+        close = Hill_cipher_keys(keys, blocks)
+        assert close.shape == (4, 50, n) and close.dtype == np.uint8
+        for key, result in zip(keys, close):
+            assert np.array_equal(result, Hill_cipher_blocks(key, blocks))
+
+
+def test_cipher_keys_other_moduli():
+    assert Hill_cipher_keys([[[256, 0], [0, 1]]], [[1, 1]], mod=257).tolist() == [[[256, 1]]]
+    p = 2 ** 31 - 1  # n (p - 1)^2 не помещается в int64 - считается через matmul_mod
+    close = Hill_cipher_keys(np.full((1, 3, 3), p - 1), np.full((1, 3), p - 1), mod=p)
+    assert close.tolist() == [[[3 * (p - 1) ** 2 % p] * 3]]
+
+
+def test_coding_many_round_trip(rng):
+    keys, _ = generate_keys(3, 2, rng=rng)
+    messages = ['ПРОСТРАНСТВО', 'АБВ', '']
+    close = start_coding_many(keys, messages)
+    assert [len(c) for c in close[0]] == [12, 2, 0]  # хвост короче ключа отбрасывается
+    for key, words in zip(keys, close):
+        assert start_decoding_many([key], words)[0] == ['ПРОСТРАНСТВО', 'АБ', '']
+
+
+def test_coding_many_empty_message_list(rng):
+    keys, _ = generate_keys(2, 3, rng=rng)
+    assert start_coding_many(keys, []) == [[], []]
+    assert start_decoding_many(keys, []) == [[], []]
@@ -0,0 +1,56 @@
+import re
+
+import numpy as np
+import pytest
+
+from hill import generate_keys, start_coding_many
+from hill_attack import best_with_ties, bigram_score, brute_force, row_attack, unigram_score
+
+
+# Обычный русский текст, только буквы алфавита шифра (Ъ и Ь выброшены)
+TEXT = re.sub('[^А-ЯЁ]', '', """
+Линейная алгебра изучает векторные пространства и линейные отображения между ними. Матрица задаёт
+такое отображение, а её определитель показывает, обратимо ли оно. Шифр Хилла использует это свойство:
+открытый текст разбивается на блоки, каждый блок умножается на ключевую матрицу по модулю размера алфавита,
+и получается шифротекст. Чтобы расшифровать сообщение, достаточно умножить блоки на обратную матрицу.
+""".upper().replace('Ь', '').replace('Ъ', ''))
+
+
+@pytest.mark.parametrize('size', [2, 3])
+def test_row_attack_finds_key_by_default(size):
+    keys, _ = generate_keys(1, size, rng=np.random.default_rng(size))
+    results, stats = row_attack(start_coding_many(keys, [TEXT])[0][0], size)
+    assert np.array_equal(results[0][1], keys[0])
+    assert stats['tried'] > 31 ** size
+
+
+def test_row_attack_keeps_unigram_ties():
+    keys, _ = generate_keys(1, 3, rng=np.random.default_rng(3))
+    results, _ = row_attack(start_coding_many(keys, [TEXT])[0][0], 3, score=unigram_score)
+    assert len(results) >= 6  # перестановки строк неразличимы по частотам букв - выдаются все 3! разом
+    assert any(np.array_equal(key, keys[0]) for _, key in results)
+
+
+def test_bigram_score_sees_letter_order():
+    codes = np.array([[[18, 19, 15]], [[19, 18, 15]]])  # СТО и ТСО
+    assert bigram_score(codes)[0] > bigram_score(codes)[1]
+    assert unigram_score(codes)[0] == unigram_score(codes)[1]
+
+
+def test_best_with_ties():
+    scores = np.array([1.0, 5.0, 3.0, 3.0, 3.0, 0.0])
+    assert best_with_ties(scores, 2).tolist() == [1, 2, 3, 4]
+    assert best_with_ties(scores, 1).tolist() == [1]
+    assert best_with_ties(scores[:2], 5).tolist() == [1, 0]
+
+
+def test_brute_force_small_key():
+    keys, _ = generate_keys(1, 2, rng=np.random.default_rng(1))
+    results, stats = brute_force(start_coding_many(keys, [TEXT[:60]])[0][0], 2, workers=1)
+    assert any(np.array_equal(key, keys[0]) for _, key in results)
+    assert 0 < stats['tried'] < 31 ** 4
+
+
+def test_brute_force_refuses_large_keys():
+    with pytest.raises(ValueError, match='row_attack'):
+        brute_force(TEXT[:90], 3)
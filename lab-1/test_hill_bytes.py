@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from hill_bytes import decrypt_bytes_file, encrypt_bytes_file, generate_byte_key, inverse_byte_key, is_invertible
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(13)
+
+
+@pytest.mark.parametrize('mod', [256, 257])
+@pytest.mark.parametrize('size', [0, 1, 7, 8, 1000])
+def test_bytes_round_trip(tmp_path, rng, mod, size):
+    payload = rng.integers(0, 256, size=size, dtype=np.uint8).tobytes()
+    src, close, back = tmp_path / 'data.bin', tmp_path / 'data.hill', tmp_path / 'data.open'
+    src.write_bytes(payload)
+    key = generate_byte_key(8, mod, rng)
+    assert encrypt_bytes_file(key, str(src), str(close), mod, chunk_blocks=4)['bytes'] == size
+    assert close.stat().st_size == (size // 8 + 1) * 8 * (1 if mod == 256 else 2)
+    assert decrypt_bytes_file(key, str(close), str(back), mod, chunk_blocks=4)['bytes'] == size
+    assert back.read_bytes() == payload
+
+
+@pytest.mark.parametrize('mod', [256, 257])
+def test_byte_key_inverse(rng, mod):
+    key = generate_byte_key(5, mod, rng)
+    assert np.array_equal(key @ inverse_byte_key(key, mod) % mod, np.eye(5, dtype=np.int64))
+
+
+def test_byte_key_checks(tmp_path):
+    assert is_invertible([[[3, 0], [0, 1]], [[2, 0], [0, 1]]], 256).tolist() == [True, False]  # нужен нечётный det
+    assert is_invertible([[2, 0], [0, 1]], 257)
+    with pytest.raises(ValueError):
+        is_invertible([[1]], 31)
+    src = tmp_path / 'data.bin'
+    src.write_bytes(b'hill')
+    with pytest.raises(ValueError):
+        encrypt_bytes_file([[2, 0], [0, 1]], str(src), str(tmp_path / 'out'), 256)
+    with pytest.raises(ValueError):  # 4 байта не делятся на блоки по 3
+        decrypt_bytes_file(np.eye(3, dtype=int), str(src), str(tmp_path / 'out'), 256)
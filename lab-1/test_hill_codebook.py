@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from hill import MODULE, Hill_cipher_blocks, codes_from_word, generate_keys, start_coding
+from hill_codebook import Codebook, all_blocks, block_indices
+
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_codebook_matches_hill(n):
+    rng = np.random.default_rng(n)
+    key = generate_keys(1, n, rng=rng)[0][0]
+    book = Codebook(key)
+    blocks = rng.integers(0, MODULE, size=(500, n)).astype(np.uint8)
+    assert np.array_equal(book.encrypt_blocks(blocks), Hill_cipher_blocks(key, blocks))
+    assert np.array_equal(book.decrypt_blocks(book.encrypt_blocks(blocks)), blocks)
+
+
+def test_codebook_text_round_trip():
+    key = [[11, 27], [20, 23]]
+    book = Codebook(key)
+    close = book.start_coding(codes_from_word('ПРОСТРАНСТВО'))
+    assert close == start_coding(key, codes_from_word('ПРОСТРАНСТВО'))
+    assert book.start_decoding(codes_from_word(close)) == 'ПРОСТРАНСТВО'
+
+
+def test_block_numbering():
+    blocks = all_blocks(2)
+    assert blocks.shape == (MODULE ** 2, 2) and blocks[MODULE + 2].tolist() == [1, 2]
+    assert np.array_equal(block_indices(blocks), np.arange(MODULE ** 2))
+
+
+def test_codebook_limits():
+    with pytest.raises(ValueError):
+        Codebook(np.eye(5, dtype=int))  # 31^5 * 5 байт больше предела
+    with pytest.raises(ValueError):
+        Codebook([[1, 2], [2, 4]])  # вырожденный ключ
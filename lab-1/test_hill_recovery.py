@@ -0,0 +1,79 @@
+import json
+from time import perf_counter
+
+import numpy as np
+import pytest
+
+from hill import MODULE, codes_from_word, generate_keys, start_coding, word_from_codes
+from hill_recovery import make_dump, recover_dump, recover_key, select_independent_blocks
+
+
+@pytest.mark.parametrize('n', [2, 3, 5, 8])
+def test_recover_key_round_trip(n):
+    rng = np.random.default_rng(n)
+    key = generate_keys(1, n, rng=rng)[0][0]
+    plain = word_from_codes(rng.integers(0, MODULE, size=4 * n * n))
+    assert np.array_equal(recover_key(plain, start_coding(key, codes_from_word(plain)), n), key)
+
+
+def test_recover_key_skips_dependent_blocks():
+    key = [[11, 27], [20, 23]]
+    plain = 'АБАБАВГДЕЖ'  # АБ = (0, 1) повторяется, АВ = (0, 2) = 2 * АБ
+    assert select_independent_blocks(codes_from_word(plain).reshape(-1, 2)) == [0, 3]
+    assert recover_key(plain, start_coding(key, codes_from_word(plain)), 2).tolist() == key
+
+
+def test_recover_key_needs_independent_blocks():
+    with pytest.raises(ValueError, match='независимых'):
+        recover_key('АБАБАВ', 'АБАБАВ', 2)
+
+
+def run_dump(tmp_path, lines: list, workers: int = 1) -> tuple:  # дамп из строк -> (статистика, ответы по id)
+    dump, output = tmp_path / 'dump.jsonl', tmp_path / 'keys.jsonl'
+    dump.write_text(''.join(line + '\n' for line in lines), encoding='utf-8')
+    stats = recover_dump(str(dump), str(output), workers=workers)
+    answers = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert len(answers) == stats['records']
+    return stats, {a['id']: a for a in answers}
+
+
+def test_recover_dump_round_trip(tmp_path):
+    dump, output = tmp_path / 'dump.jsonl', tmp_path / 'keys.jsonl'
+    make_dump(str(dump), 300, seed=1)
+    records = {r['id']: r for r in map(json.loads, dump.read_text(encoding='utf-8').splitlines())}
+    for workers in (1, 2):
+        stats = recover_dump(str(dump), str(output), workers=workers, batch_size=64)
+        assert stats['records'] == 300 and stats['recovered'] + stats['failed'] == 300
+        assert stats['recovered'] > 250  # неудачи - только вырожденные случайные открытые тексты
+        for line in output.read_text(encoding='utf-8').splitlines():
+            answer = json.loads(line)
+            assert 'key' in answer or 'error' in answer
+            assert answer['id'] in records
+
+
+def test_recover_dump_reports_malformed_lines(tmp_path):
+    good = {'id': 'good', 'open': 'ПРОСТРАНСТВО', 'close': 'ОЮАБРЫЁЛЮХЧМ', 'size': 2}
+    lines = [json.dumps(good, ensure_ascii=False), '{oops', '[1, 2]',
+             json.dumps({'id': 'no_close', 'open': 'АБ', 'size': 2}),
+             json.dumps({'id': 'zero', 'open': 'АБ', 'close': 'АБ', 'size': 0}),
+             json.dumps({'id': 'float', 'open': 'АБВГ', 'close': 'АБВГ', 'size': 2.9}),
+             json.dumps({'id': 'string', 'open': 'АБВГ', 'close': 'АБВГ', 'size': '2'}),
+             json.dumps({'id': 'bool', 'open': 'А', 'close': 'А', 'size': True}),
+             json.dumps({'id': 'latin', 'open': 'HILL', 'close': 'HILL', 'size': 2}),
+             json.dumps({'id': 'short', 'open': 'АБ', 'close': 'АБ', 'size': 2})]
+    stats, answers = run_dump(tmp_path, lines)
+    assert stats['records'] == len(lines) and stats['recovered'] == 1
+    assert answers['good']['key'] == [[11, 27], [20, 23]]
+    assert "'close'" in answers['no_close']['error']
+    for record_id in ('zero', 'float', 'string', 'bool', 'latin', 'short'):
+        assert 'error' in answers[record_id]
+    assert answers[1]['error'] and answers[2]['error']  # без id - номер строки
+
+
+def test_short_record_with_huge_size_is_cheap(tmp_path):
+    lines = [json.dumps({'id': 0, 'open': 'ПРОСТРАНСТВО', 'close': 'ОЮАБРЫЁЛЮХЧМ', 'size': 2}, ensure_ascii=False),
+             json.dumps({'id': 1, 'open': 'АБВГ', 'close': 'АБВГ', 'size': 1500}, ensure_ascii=False)]
+    start = perf_counter()
+    _, answers = run_dump(tmp_path, lines)
+    assert perf_counter() - start < 5
+    assert 'key' in answers[0] and 'блоков 0' in answers[1]['error']
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import hill_service
+from hill_service import HillService, serve
+
+
+# На любой запрос, даже испорченный, приходит ответ
+KEY = [[11, 27], [20, 23]]
+
+
+def exchange(tmp_path, lines: list) -> dict:  # отправляет строки в сервис на Unix-сокете, ответы по id
+    async def run():
+        path = str(tmp_path / 'hill.sock')
+        server = await serve(path=path, service=HillService(batch_window=0.001))
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path, limit=hill_service.LINE_LIMIT)
+            writer.write(b''.join(line.encode('utf-8') + b'\n' for line in lines))
+            writer.write_eof()
+            responses = [json.loads(line) for line in (await asyncio.wait_for(reader.read(), 10)).splitlines()]
+            writer.close()
+        return responses
+
+    responses = asyncio.run(run())
+    assert len(responses) == len(lines)
+    return {r.get('id'): r for r in responses}
+
+
+def test_service_answers_malformed_requests(tmp_path):
+    requests = [
+        {'id': 1, 'op': 'encrypt', 'key': KEY, 'text': 'ПРОСТРАНСТВО'},
+        {'id': 2, 'op': 'encrypt', 'key': KEY, 'text': 123},
+        {'id': 3, 'op': 'encrypt', 'key': 5, 'text': 'АБ'},
+        {'id': 4, 'op': 'encrypt', 'key': [[1, 2, 3], [4, 5, 6]], 'text': 'АБ'},
+        {'id': 5, 'op': 'decrypt', 'key': [[1, 2], [2, 4]], 'text': 'АБ'},
+        {'id': 6, 'op': 'recover', 'open': 'АБВГ', 'close': 'АБВГ', 'size': 0},
+        {'id': 7, 'op': 'encrypt', 'key': KEY},
+        {'id': 8, 'op': 'rotate'},
+        {'id': 9, 'op': 'encrypt', 'key': KEY, 'text': 'АБ'},
+        {'id': 10, 'op': 'encrypt', 'key': KEY, 'text': 'HILL'},  # ломает пачку ключа KEY, считается отдельно
+    ]
+    responses = exchange(tmp_path, [json.dumps(r, ensure_ascii=False) for r in requests] + ['[1, 2]', '{oops'])
+    assert responses[1] == {'id': 1, 'text': 'ОЮАБРЫЁЛЮХЧМ'}
+    assert responses[9]['text'] == 'ЫЦ'  # плохие соседи по пачке не мешают
+    for i in (2, 3, 4, 5, 6, 7, 8, 10):
+        assert 'error' in responses[i], responses[i]
+    assert 'error' in responses[None]  # ответы на '[1, 2]' и '{oops' - без id
+
+
+def test_service_recover_and_stats(tmp_path):
+    requests = [{'id': 1, 'op': 'recover', 'open': 'ПРОСТРАНСТВО', 'close': 'ОЮАБРЫЁЛЮХЧМ', 'size': 2},
+                {'id': 2, 'op': 'stats'}]
+    responses = exchange(tmp_path, [json.dumps(r, ensure_ascii=False) for r in requests])
+    assert responses[1]['key'] == [[11, 27], [20, 23]]
+    assert 'requests' in responses[2]['stats']
+
+
+def test_service_skips_oversized_line(tmp_path, monkeypatch):
+    monkeypatch.setattr(hill_service, 'LINE_LIMIT', 1 << 12)
+    long_request = {'id': 2, 'op': 'encrypt', 'key': KEY, 'text': 'А' * (1 << 12)}
+    lines = [json.dumps(r, ensure_ascii=False) for r in
+             ({'id': 1, 'op': 'encrypt', 'key': KEY, 'text': 'АБ'}, long_request, {'id': 3, 'op': 'stats'})]
+    responses = exchange(tmp_path, lines)
+    assert responses[1]['text'] == 'ЫЦ' and 'stats' in responses[3]
+    assert 'длиннее' in responses[None]['error']
+
+
+def test_service_accepts_lines_over_default_stream_limit(tmp_path):
+    text = 'ПРОСТРАНСТВО' * 5000  # 60 тысяч букв, больше 64 КиБ в UTF-8
+    responses = exchange(tmp_path, [json.dumps({'id': 1, 'op': 'encrypt', 'key': KEY, 'text': text}, ensure_ascii=False)])
+    assert responses[1]['text'] == 'ОЮАБРЫЁЛЮХЧМ' * 5000
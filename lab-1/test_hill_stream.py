@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from hill import codes_from_word, start_coding
+from hill_stream import decrypt_file, encrypt_file, iter_blocks, strip_padding
+
+
+KEY = [[11, 27], [20, 23]]
+KEY3 = [[13, 12, 11], [19, 30, 22], [24, 26, 8]]
+TEXT = 'Пространство и время, ПРОСТРАНСТВО! '
+
+
+def write(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 16])
+def test_pkcs_round_trip(tmp_path, chunk_size):
+    src = write(tmp_path, 'open.txt', TEXT * 7)
+    letters = len(codes_from_word('ПРОСТРАНСТВОИВРЕМЯПРОСТРАНСТВО')) * 7
+    for key in (KEY, KEY3):
+        stats = encrypt_file(key, src, str(tmp_path / 'close.txt'), chunk_size=chunk_size)
+        assert stats['letters'] % len(key) == 0 and stats['letters'] > letters  # всегда есть блок с дополнением
+        decrypt_file(key, str(tmp_path / 'close.txt'), str(tmp_path / 'back.txt'), chunk_size=chunk_size)
+        assert (tmp_path / 'back.txt').read_text(encoding='utf-8') == 'ПРОСТРАНСТВОИВРЕМЯПРОСТРАНСТВО' * 7
+
+
+def test_drop_matches_start_coding(tmp_path):
+    src = write(tmp_path, 'open.txt', 'ПРОСТРАНСТВОИ')
+    encrypt_file(KEY, src, str(tmp_path / 'close.txt'), chunk_size=3, padding='drop')
+    close = (tmp_path / 'close.txt').read_text(encoding='utf-8')
+    assert close == start_coding(KEY, codes_from_word('ПРОСТРАНСТВОИ'))  # хвост короче ключа отброшен
+    decrypt_file(KEY, str(tmp_path / 'close.txt'), str(tmp_path / 'back.txt'), padding='drop')
+    assert (tmp_path / 'back.txt').read_text(encoding='utf-8') == 'ПРОСТРАНСТВО'
+
+
+def test_padding_errors(tmp_path):
+    with pytest.raises(ValueError):
+        list(iter_blocks(iter([np.arange(5, dtype=np.uint8)]), 2, padding='none'))
+    with pytest.raises(ValueError):
+        list(iter_blocks(iter([]), 2, padding='zeros'))
+    with pytest.raises(ValueError):
+        list(strip_padding(iter([np.array([[1, 5]], dtype=np.uint8)]), 2))  # q = 5 больше длины блока
+    src = write(tmp_path, 'close.txt', 'АБВГ')
+    with pytest.raises(ValueError):  # шифротекст не от этого ключа - дополнение не сходится
+        decrypt_file(KEY, src, str(tmp_path / 'back.txt'))
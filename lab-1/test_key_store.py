@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from hill import MODULE, generate_keys
+from key_store import KeyStore, write_store
+from modular import det_mod
+
+
+P = MODULE
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(31)
+
+
+def test_key_store_round_trip(tmp_path, rng):
+    keys, _ = generate_keys(100, 3, rng=rng)
+    ids = rng.permutation(1000)[:100]
+    path = str(tmp_path / 'keys.hks')
+    assert write_store(path, keys, ids=ids) == 100
+
+    store = KeyStore(path)
+    assert len(store) == 100 and store.size == 3 and store.mod == P
+    for i in (0, 57, 99):
+        prepared = store.get(int(ids[i]))
+        assert np.array_equal(prepared.key, keys[i])
+        assert np.array_equal(prepared.key @ prepared.inverse % P, np.eye(3, dtype=np.int64))
+        assert prepared.det == int(det_mod(keys[i], P))
+    missing = int(np.setdiff1d(np.arange(1000), ids)[0])
+    assert missing not in store
+    with pytest.raises(KeyError):
+        store.get(missing)
+
+
+def test_key_store_rejects_bad_input(tmp_path):
+    path = str(tmp_path / 'keys.hks')
+    with pytest.raises(ValueError):
+        write_store(path, [[[1, 2], [2, 4]]])  # вырожденный ключ
+    with pytest.raises(ValueError):
+        write_store(path, [[[3, 0], [0, 1]]], mod=256)  # не поле: обратные по det_mod и inv_mod неверны
+    with pytest.raises(ValueError):
+        write_store(path, np.stack([np.eye(2, dtype=int)] * 2), ids=[5, 5])
+    (tmp_path / 'other').write_bytes(b'not a key store')
+    with pytest.raises(ValueError):
+        KeyStore(str(tmp_path / 'other'))
+
+
+def test_key_store_other_prime_modulus(tmp_path):
+    path = str(tmp_path / 'keys.hks')
+    write_store(path, [[[3, 0], [0, 1]]], mod=251)
+    prepared = KeyStore(path).get(0)
+    assert prepared.inverse.tolist() == [[84, 0], [0, 1]] and prepared.det == 3
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from sympy import Matrix
+
+from hill import MODULE, generate_keys
+from modular import det_mod, inv_mod, inv_mod_array, rank_mod, solve_mod_batch
+
+
+# Проверки запускаются из корня репозитория: python -m pytest -q lab-1
+P = MODULE
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(31)
+
+
+def test_det_mod_matches_sympy(rng):
+    for n in (1, 2, 3, 5, 8):
+        keys = rng.integers(0, P, size=(20, n, n))
+        expected = [int(Matrix(k.tolist()).det()) % P for k in keys]
+        assert det_mod(keys, P).tolist() == expected
+
+
+def test_det_mod_keeps_batch_shape_and_finds_singular():
+    singular = np.array([[1, 2], [2, 4]])
+    dets = det_mod(np.stack([singular, np.eye(2, dtype=int)]).reshape(1, 2, 2, 2), P)
+    assert dets.shape == (1, 2)
+    assert dets.tolist() == [[0, 1]]
+
+
+def test_inv_mod_round_trip(rng):
+    keys, _ = generate_keys(10, 6, rng=rng)
+    for key in keys:
+        assert np.array_equal(key @ inv_mod(key, P) % P, np.eye(6, dtype=np.int64))
+
+
+def test_inv_mod_rejects_singular_and_non_square():
+    with pytest.raises(ValueError):
+        inv_mod([[1, 2], [2, 4]], P)
+    with pytest.raises(ValueError):
+        inv_mod([[1, 2, 3], [4, 5, 6]], P)
+
+
+def test_solve_mod_batch_round_trip(rng):
+    a, _ = generate_keys(50, 4, rng=rng)
+    x = rng.integers(0, P, size=(50, 4, 3))
+    solution, full_rank, consistent = solve_mod_batch(a, a @ x % P, P)
+    assert full_rank.all() and consistent.all()
+    assert np.array_equal(solution, x)
+
+
+def test_solve_mod_batch_extra_rows_check_consistency(rng):
+    a = rng.integers(0, P, size=(2, 6, 3))
+    x = rng.integers(0, P, size=(2, 3, 1))
+    b = a @ x % P
+    b[1, -1, 0] = (b[1, -1, 0] + 1) % P  # лишнее уравнение второй системы перестаёт сходиться
+    solution, full_rank, consistent = solve_mod_batch(a, b, P)
+    assert full_rank.tolist() == [rank_mod(a[0], P) == 3, rank_mod(a[1], P) == 3]
+    assert consistent.tolist() == [True, False]
+    assert np.array_equal(solution[0], x[0])
+
+
+def test_solve_mod_batch_fewer_rows_than_unknowns(rng):
+    a = rng.integers(0, P, size=(3, 2, 4))
+    _, full_rank, _ = solve_mod_batch(a, rng.integers(0, P, size=(3, 2, 1)), P)
+    assert not full_rank.any()
+
+
+def test_inv_mod_array_maps_zero_to_zero():
+    for p in (2, 3, 31, 257):
+        x = np.arange(p)
+        inverse = inv_mod_array(x, p)
+        assert inverse[0] == 0
+        assert np.all(x[1:] * inverse[1:] % p == 1)
+    assert det_mod([[1, 1], [1, 1]], 2) == 0 and det_mod([[1, 1], [0, 1]], 2) == 1
@@ -0,0 +1,50 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from hill import codes_from_word
+from ngram_model import NgramModel, build_model
+
+
+CORPUS = 'Пространство и время. ' * 50 + 'Линейная алгебра изучает векторы и матрицы. ' * 30
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    corpus = tmp_path / 'corpus.txt'
+    corpus.write_text(CORPUS, encoding='utf-8')
+    path = str(tmp_path / 'model.ngram')
+    stats = build_model(str(corpus), path, chunk_size=7)  # маленькие куски - n-граммы на стыках
+    assert stats['alphabet'] == 31 and stats['letters'] > 1000
+    return path
+
+
+def test_model_prefers_corpus_order(model_path):
+    model = NgramModel(model_path)
+    texts = np.stack([codes_from_word('ПРОСТРАНСТВО'), codes_from_word('ОВТСНАРТСОРП')])
+    scores = model(texts.reshape(2, 4, 3))  # (k, B, n), как в атаках
+    assert scores[0] > scores[1]
+    unigram = NgramModel(model_path, order=1)(texts)
+    assert unigram[0] == pytest.approx(unigram[1])  # частоты букв порядка не видят
+
+
+@pytest.mark.parametrize('order', [1, 2, 3])
+def test_short_texts(model_path, order):
+    model = NgramModel(model_path, order)
+    for length in (0, 1, 2, 3):
+        assert model.score(np.zeros((4, length), dtype=np.uint8)).shape == (4,)
+    one = codes_from_word('П')[None, :]
+    assert model.score(one)[0] == pytest.approx(model.uni[one[0, 0]])
+    assert model.score(np.empty((2, 0), dtype=np.uint8)).tolist() == [0.0, 0.0]
+
+
+def test_model_file_checks(model_path, tmp_path):
+    with pytest.raises(ValueError):
+        NgramModel(model_path, order=4)
+    bad = tmp_path / 'bad.ngram'
+    bad.write_bytes(b'not a model')
+    with pytest.raises(ValueError):
+        NgramModel(str(bad))
+    copy = pickle.loads(pickle.dumps(NgramModel(model_path, order=2)))  # в пул процессов уходит только путь
+    assert copy.order == 2 and copy.path == model_path
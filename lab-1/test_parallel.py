@@ -0,0 +1,13 @@
+from parallel import pool_map
+from report import per_second
+
+
+def test_pool_map_keeps_task_order():
+    for workers in (1, 2):
+        assert list(pool_map(abs, (-i for i in range(50)), workers)) == list(range(50))
+    assert list(pool_map(abs, [], 2)) == []
+
+
+def test_per_second():
+    assert per_second(10, 2) == 5
+    assert per_second(10, 0) == float('inf')
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import report
+from hill import start_coding
+from report import DETAIL, SILENT, SUMMARY, annotation, pretty, say, show
+
+
+@pytest.fixture
+def level():
+    previous = report.level
+    yield report.set_level
+    report.set_level(previous)
+
+
+def test_levels_and_lazy_messages(level, capsys):
+    level(SUMMARY)
+    say(SUMMARY, lambda: 'итог')
+    say(DETAIL, lambda: pytest.fail('на выключенном уровне текст не строится'))
+    show(DETAIL, 'Векторы', lambda: pytest.fail('и набор тоже'))
+    assert capsys.readouterr().out == 'итог\n'
+
+
+def test_show_annot_is_still_gated_by_level(level, capsys):
+    level(SILENT)
+    assert start_coding([[11, 27], [20, 23]], [16, 17], show_annot=True) == 'ОЮ'
+    assert capsys.readouterr().out == ''
+    level(DETAIL)
+    start_coding([[11, 27], [20, 23]], [16, 17], show_annot=False)
+    assert capsys.readouterr().out == ''
+    start_coding([[11, 27], [20, 23]], [16, 17], show_annot=True)
+    assert 'Ключ' in capsys.readouterr().out
+    assert annotation(True, SUMMARY) == SUMMARY and annotation(False) > DETAIL
+
+
+def test_pretty_truncates_large_collections():
+    vectors = list(np.arange(2000).reshape(1000, 2))
+    text = pretty('Векторы', vectors, limit=4)
+    assert 'Всего 1000 векторов высоты 2' in text and 'пропущено 996' in text
+    assert '1999' in text and '500' not in text
+    assert pretty(None, (vectors[0], vectors[1])).startswith('⎛')  # кортеж - в круглых скобках